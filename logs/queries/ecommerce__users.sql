@@ -0,0 +1 @@
+SELECT user_id FROM users
\ No newline at end of file
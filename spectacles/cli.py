@@ -11,15 +11,16 @@ from argparse import ArgumentParser, Namespace
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Sequence, Union, cast
 
-import httpx
 import yaml
 from yaml.parser import ParserError
 
 import spectacles.printer as printer
 from spectacles.client import (
     DEFAULT_API_VERSION,
+    DEFAULT_MAX_CONNECTIONS,
     LOOKML_VALIDATION_TIMEOUT,
     LookerClient,
+    create_async_client,
 )
 from spectacles.exceptions import (
     GenericValidationError,
@@ -324,6 +325,7 @@ def main() -> None:
                 pin_imports=pin_imports,
                 ignore_hidden=args.ignore_hidden,
                 use_personal_branch=args.use_personal_branch,
+                cache_dir=args.cache_dir,
             )
         )
     elif args.command == "assert":
@@ -692,6 +694,17 @@ def _build_sql_subparser(
         action="store_true",
         help=("Exclude hidden fields from validation."),
     )
+    subparser.add_argument(
+        "--cache-dir",
+        action=EnvVarAction,
+        env_var="SPECTACLES_CACHE_DIR",
+        help=(
+            "The directory to cache explore dimensions in between runs. "
+            "Only used when the LookML being tested is pinned to commits, "
+            "e.g. when testing a commit SHA. Old entries are never removed, "
+            "so clear the directory from time to time."
+        ),
+    )
     _build_validator_subparser(subparser_action, subparser)
     _build_select_subparser(subparser_action, subparser)
 
@@ -774,8 +787,7 @@ async def run_connect(
     base_url: str, client_id: str, client_secret: str, port: int, api_version: float
 ) -> None:
     """Tests the connection and credentials for the Looker API."""
-    # Don't trust env to ignore .netrc credentials
-    async_client = httpx.AsyncClient(trust_env=False)
+    async_client = create_async_client()
     try:
         LookerClient(
             async_client, base_url, client_id, client_secret, port, api_version
@@ -799,8 +811,7 @@ async def run_lookml(
     use_personal_branch: bool,
     timeout: int,
 ) -> None:
-    # Don't trust env to ignore .netrc credentials
-    async_client = httpx.AsyncClient(trust_env=False)
+    async_client = create_async_client()
     try:
         client = LookerClient(
             async_client, base_url, client_id, client_secret, port, api_version
@@ -808,6 +819,7 @@ async def run_lookml(
         runner = Runner(client, project, remote_reset, pin_imports, use_personal_branch)
 
         results = await runner.validate_lookml(ref, severity, timeout)
+        client.log_latencies()
     finally:
         await async_client.aclose()
 
@@ -858,8 +870,7 @@ async def run_content(
     pin_imports: Dict[str, str],
     use_personal_branch: bool,
 ) -> None:
-    # Don't trust env to ignore .netrc credentials
-    async_client = httpx.AsyncClient(trust_env=False)
+    async_client = create_async_client()
     try:
         client = LookerClient(
             async_client, base_url, client_id, client_secret, port, api_version
@@ -874,6 +885,7 @@ async def run_content(
             exclude_personal,
             folders,
         )
+        client.log_latencies()
     finally:
         await async_client.aclose()
 
@@ -919,15 +931,23 @@ async def run_assert(
     use_personal_branch: bool,
     concurrency: int,
 ) -> None:
-    # Don't trust env to ignore .netrc credentials
-    async_client = httpx.AsyncClient(trust_env=False)
+    # Size the pool so every concurrent data test can hold its own connection
+    max_connections = max(concurrency, DEFAULT_MAX_CONNECTIONS)
+    async_client = create_async_client(max_connections=max_connections)
     try:
         client = LookerClient(
-            async_client, base_url, client_id, client_secret, port, api_version
+            async_client,
+            base_url,
+            client_id,
+            client_secret,
+            port,
+            api_version,
+            max_connections=max_connections,
         )
         runner = Runner(client, project, remote_reset, pin_imports, use_personal_branch)
 
         results = await runner.validate_data_tests(ref, filters, concurrency)
+        client.log_latencies()
     finally:
         await async_client.aclose()
 
@@ -980,13 +1000,22 @@ async def run_sql(
     pin_imports: Dict[str, str],
     use_personal_branch: bool,
     ignore_hidden: bool,
+    cache_dir: Optional[str] = None,
 ) -> None:
     """Runs and validates the SQL for each selected LookML dimension."""
-    # Don't trust env to ignore .netrc credentials
-    async_client = httpx.AsyncClient(trust_env=False)
+    # Size the pool so every concurrent query can hold its own connection
+    max_connections = max(concurrency, DEFAULT_MAX_CONNECTIONS)
+    async_client = create_async_client(max_connections=max_connections)
     try:
         client = LookerClient(
-            async_client, base_url, client_id, client_secret, port, api_version
+            async_client,
+            base_url,
+            client_id,
+            client_secret,
+            port,
+            api_version,
+            max_connections=max_connections,
+            cache_dir=Path(cache_dir) if cache_dir else None,
         )
         runner = Runner(client, project, remote_reset, pin_imports, use_personal_branch)
 
@@ -1002,6 +1031,7 @@ async def run_sql(
             chunk_size,
             ignore_hidden,
         )
+        client.log_latencies()
     finally:
         await async_client.aclose()
 
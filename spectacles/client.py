@@ -1,12 +1,19 @@
 import asyncio
+import hashlib
 import json
+import os
+import statistics
+import tempfile
 import time
+from collections import defaultdict
 from dataclasses import dataclass
 from http import HTTPStatus
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Callable, DefaultDict, Dict, List, Optional, Tuple
 
 import backoff
 import httpx
+import orjson
 from aiocache import Cache, cached, serializers
 from httpx import HTTPStatusError, NetworkError, RemoteProtocolError, TimeoutException
 
@@ -18,7 +25,23 @@ from spectacles.models import JsonDict
 DEFAULT_API_VERSION = 4.0
 TIMEOUT_SEC = 300
 LOOKML_VALIDATION_TIMEOUT = 7200
-MAX_ASYNC_CONNECTIONS = 200
+# Looker instances tend to throttle large bursts of API requests, so a modest pool
+# (somewhere between 5 and 50 connections) outperforms httpx's default of 100
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+
+# Path segments following these are identifiers, e.g. a project or explore name, so
+# they're collapsed when grouping request latencies by endpoint
+IDENTIFIED_RESOURCES = frozenset(
+    (
+        "projects",
+        "git_branch",
+        "lookml_models",
+        "explores",
+        "queries",
+        "running_queries",
+    )
+)
 
 DEFAULT_RETRIES = 3
 DEFAULT_NETWORK_RETRIES = 10
@@ -66,6 +89,24 @@ class AccessToken:
         return False if time.time() < self.expires_at else True
 
 
+def create_async_client(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+) -> httpx.AsyncClient:
+    """Creates an HTTP client with a connection pool sized for the Looker API.
+
+    HTTP/2 is enabled so concurrent requests (e.g. fetching every explore's
+    dimensions) can be multiplexed over a single connection where the instance
+    supports it. Responses are gzip-compressed by default.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+    )
+    # Don't trust env to ignore .netrc credentials
+    return httpx.AsyncClient(trust_env=False, limits=limits, http2=True)
+
+
 def backoff_with_exceptions(func: Callable[..., Any]) -> Callable[..., Any]:
     @backoff.on_exception(
         backoff.expo,
@@ -96,6 +137,11 @@ class LookerClient:
         client_secret: Looker API client secret.
         port: Desired API port to use for requests.
         api_version: Desired API version to use for requests.
+        max_connections: Maximum number of concurrent requests to fan out at once.
+            Should match the connection limit of `async_client`.
+        cache_dir: Directory to persist explore dimensions in between runs. Only
+            used while `lookml_revision` identifies the LookML in use. Entries are
+            never evicted, so each new revision adds a file per explore.
 
     Attributes:
         api_url: Combined URL used as a base for request building.
@@ -111,8 +157,12 @@ class LookerClient:
         client_secret: str,
         port: Optional[int] = None,
         api_version: float = DEFAULT_API_VERSION,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        cache_dir: Optional[Path] = None,
     ):
         self.async_client = async_client
+        self.max_connections = max_connections
+        self.cache_dir = cache_dir
         supported_api_versions = [4.0]
         if api_version not in supported_api_versions:
             raise SpectaclesException(
@@ -142,9 +192,51 @@ class LookerClient:
         self.api_version: float = api_version
         self.access_token: Optional[AccessToken] = None
         self.workspace: str = "production"
+        # Responses from read-only endpoints that can only change when the session's
+        # workspace or branch changes, keyed on the endpoint and its arguments
+        self._state_cache: Dict[Tuple[Any, ...], Any] = {}
+        # Identifies the LookML visible to the session (e.g. by project commits), if
+        # it's fully determined. Set by the branch manager, reset on any Git change
+        self.lookml_revision: Optional[str] = None
+        # Seconds taken by each request, keyed on method and endpoint
+        self._latencies: DefaultDict[str, List[float]] = defaultdict(list)
 
         self.authenticate()
 
+    def _clear_state_cache(self) -> None:
+        """Discards cached responses after the workspace or a branch changes."""
+        self._state_cache.clear()
+        self.lookml_revision = None
+
+    def _disk_cache_path(self, *key: str) -> Optional[Path]:
+        """Returns the file a response is persisted to, if the LookML is known."""
+        if self.cache_dir is None or self.lookml_revision is None:
+            return None
+        digest = hashlib.sha256(
+            orjson.dumps(
+                [self.base_url, self.looker_version, self.lookml_revision, *key]
+            )
+        ).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def _write_disk_cache(self, cache_path: Path, content: bytes) -> None:
+        """Persists a response, replacing the file in one step so concurrent runs
+        sharing the directory never read a partly written file."""
+        temp_path: Optional[str] = None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=cache_path.parent, suffix=".tmp", delete=False
+            ) as file:
+                temp_path = file.name
+                file.write(content)
+            os.replace(temp_path, cache_path)
+        except OSError as error:
+            # The cache is only an optimization, so a failed write isn't fatal
+            logger.debug(f"Unable to write to the cache at {cache_path}: {error}")
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
     def authenticate(self) -> None:
         """Logs in to Looker's API using a client ID/secret pair and an API version.
 
@@ -179,13 +271,15 @@ class LookerClient:
             # Calculate the expiration time with a one-minute buffer
             result["expires_at"] = time.time() + result["expires_in"] - 60
         self.access_token = AccessToken(**result)
+        # Each new API session starts out in the production workspace
+        self.workspace = "production"
         self.async_client.headers = httpx.Headers(
             {"Authorization": f"token {self.access_token}"}
         )
 
-        looker_version = self.get_looker_release_version()
+        self.looker_version: str = self.get_looker_release_version()
         logger.info(
-            f"Connected to Looker version {looker_version} "
+            f"Connected to Looker version {self.looker_version} "
             f"using Looker API {self.api_version}"
         )
 
@@ -194,10 +288,59 @@ class LookerClient:
     ) -> httpx.Response:
         if self.access_token and self.access_token.expired:
             logger.debug("Looker API access token has expired, requesting a new one")
+            workspace = self.workspace
             self.authenticate()
-            if self.workspace == "dev":
-                await self.update_workspace("dev")
-        return await self.async_client.request(method, url, *args, **kwargs)
+            await self.update_workspace(workspace)
+        start = time.perf_counter()
+        try:
+            return await self.async_client.request(method, url, *args, **kwargs)
+        finally:
+            # Failed requests count too, since timeouts are often the slowest calls
+            elapsed = time.perf_counter() - start
+            self._latencies[self._endpoint(method, url)].append(elapsed)
+
+    def _endpoint(self, method: str, url: str) -> str:
+        """Groups a request URL by endpoint, e.g. 'GET projects/*/git_branch'."""
+        path = httpx.URL(url).path.split(f"/api/{self.api_version}/", 1)[-1]
+        segments = path.strip("/").split("/")
+        for i in range(1, len(segments)):
+            if segments[i - 1] in IDENTIFIED_RESOURCES:
+                segments[i] = "*"
+        return f"{method} {'/'.join(segments)}"
+
+    def report_latencies(self) -> Dict[str, Dict[str, float]]:
+        """Summarizes request latencies in seconds for each endpoint called so far.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Request count and p50/p95/p99 latencies
+                for each endpoint, slowest total time first.
+
+        """
+        report = {}
+        for endpoint, latencies in sorted(
+            self._latencies.items(), key=lambda item: sum(item[1]), reverse=True
+        ):
+            if len(latencies) > 1:
+                percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+                p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+            else:
+                p50 = p95 = p99 = latencies[0]
+            report[endpoint] = {
+                "count": len(latencies),
+                "p50": p50,
+                "p95": p95,
+                "p99": p99,
+            }
+        return report
+
+    def log_latencies(self) -> None:
+        """Logs the request latency summary at debug level."""
+        for endpoint, summary in self.report_latencies().items():
+            logger.debug(
+                f"{endpoint}: {summary['count']:.0f} requests, "
+                f"p50 {summary['p50']:.3f}s, p95 {summary['p95']:.3f}s, "
+                f"p99 {summary['p99']:.3f}s"
+            )
 
     async def get(self, url: str, *args: Any, **kwargs: Any) -> httpx.Response:
         return await self.request("GET", url, *args, **kwargs)
@@ -285,6 +428,8 @@ class LookerClient:
         Args:
             workspace: The workspace to switch to, either 'production' or 'dev'
         """
+        if workspace == self.workspace:
+            return
         logger.debug(f"Updating session to use the {workspace} workspace")
         url = utils.compose_url(self.api_url, path=["session"])
         body = {"workspace_id": workspace}
@@ -305,14 +450,21 @@ class LookerClient:
                 response=response,
             ) from error
         self.workspace = workspace
+        self._clear_state_cache()
 
     @backoff_with_exceptions
     async def get_all_branches(self, project: str) -> List[JsonDict]:
         """Returns a list of git branches in the project repository.
 
+        The response is cached until the workspace or branch changes.
+
         Args:
             project: Name of the Looker project to use.
         """
+        cache_key = ("git_branches", self.workspace, project)
+        if cache_key in self._state_cache:
+            return self._state_cache[cache_key]  # type: ignore[no-any-return]
+
         logger.debug(f"Getting all Git branches in project '{project}'")
         url = utils.compose_url(
             self.api_url, path=["projects", project, "git_branches"]
@@ -332,7 +484,9 @@ class LookerClient:
                 response=response,
             ) from error
 
-        return response.json()  # type: ignore[no-any-return]
+        branches: List[JsonDict] = response.json()
+        self._state_cache[cache_key] = branches
+        return branches
 
     @backoff_with_exceptions
     async def checkout_branch(self, project: str, branch: str) -> None:
@@ -360,6 +514,7 @@ class LookerClient:
                 ),
                 response=response,
             ) from error
+        self._clear_state_cache()
 
     @backoff_with_exceptions
     async def reset_to_remote(self, project: str) -> None:
@@ -387,6 +542,7 @@ class LookerClient:
                 ),
                 response=response,
             ) from error
+        self._clear_state_cache()
 
     @backoff_with_exceptions
     async def get_manifest(self, project: str) -> JsonDict:
@@ -425,12 +581,18 @@ class LookerClient:
     async def get_active_branch(self, project: str) -> JsonDict:
         """Gets the active branch for the user in the given project.
 
+        The response is cached until the workspace or branch changes.
+
         Args:
             project: Name of the Looker project to use.
 
         Returns:
             str: Name of the active branch
         """
+        cache_key = ("git_branch", self.workspace, project)
+        if cache_key in self._state_cache:
+            return self._state_cache[cache_key]  # type: ignore[no-any-return]
+
         logger.debug(f"Getting active branch for project '{project}'")
         url = utils.compose_url(self.api_url, path=["projects", project, "git_branch"])
         response = await self.get(url=url, timeout=TIMEOUT_SEC)
@@ -450,14 +612,16 @@ class LookerClient:
                 response=response,
             ) from error
 
-        branch_name = response.json()["name"]
-        logger.debug(f"The active branch is '{branch_name}'")
-
-        return response.json()  # type: ignore[no-any-return]
+        branch: JsonDict = response.json()
+        logger.debug(f"The active branch is '{branch['name']}'")
+        self._state_cache[cache_key] = branch
+        return branch
 
-    @backoff_with_exceptions
     async def get_active_branch_name(self, project: str) -> str:
-        """Helper method to return only the branch name."""
+        """Helper method to return only the branch name.
+
+        Not wrapped in a backoff itself, since get_active_branch already retries.
+        """
         full_response = await self.get_active_branch(project)
         return full_response["name"]  # type: ignore[no-any-return]
 
@@ -504,6 +668,7 @@ class LookerClient:
                 detail=detail,
                 response=response,
             ) from error
+        self._clear_state_cache()
 
     @backoff_with_exceptions
     async def hard_reset_branch(self, project: str, branch: str, ref: str) -> None:
@@ -539,6 +704,7 @@ class LookerClient:
                 ),
                 response=response,
             ) from error
+        self._clear_state_cache()
 
     @backoff_with_exceptions
     async def delete_branch(self, project: str, branch: str) -> None:
@@ -568,6 +734,7 @@ class LookerClient:
                 ),
                 response=response,
             ) from error
+        self._clear_state_cache()
 
     @backoff_with_exceptions
     async def all_lookml_tests(self, project: str) -> List[JsonDict]:
@@ -665,14 +832,23 @@ class LookerClient:
     ) -> List[JsonDict]:
         """Gets all models and explores from the LookmlModel endpoint.
 
+        The response is cached until the workspace or branch changes, so repeated
+        calls across validators don't download the same models again.
+
         Returns:
             List[JsonDict]: JSON response containing LookML models and explores.
 
         """
-        logger.debug(f"Getting all models and explores from {self.base_url}")
         if fields is None:
             fields = []
 
+        cache_key = ("lookml_models", self.workspace, tuple(fields))
+        if cache_key in self._state_cache:
+            logger.debug("Using cached models and explores")
+            return self._state_cache[cache_key]  # type: ignore[no-any-return]
+
+        logger.debug(f"Getting all models and explores from {self.base_url}")
+
         params: Dict[str, Any] = {}
         if fields:
             params["fields"] = fields
@@ -690,13 +866,61 @@ class LookerClient:
                 response=response,
             ) from error
 
-        return response.json()  # type: ignore[no-any-return]
+        # Model and dimension payloads can be several MB, so parse them with orjson
+        models: List[JsonDict] = orjson.loads(response.content)
+        self._state_cache[cache_key] = models
+        return models
+
+    async def get_lookml_models_for_project(
+        self, project: str, fields: Optional[List[str]] = None
+    ) -> List[JsonDict]:
+        """Gets the models and explores that belong to a single LookML project.
+
+        The LookmlModel endpoint can't filter by project, so this filters the
+        (cached) response from `get_lookml_models` instead.
+
+        Returns:
+            List[JsonDict]: JSON response containing the project's models and explores.
+
+        """
+        if fields and "project_name" not in fields:
+            fields = [*fields, "project_name"]
+        return [
+            model
+            for model in await self.get_lookml_models(fields=fields)
+            if model["project_name"] == project
+        ]
 
     @backoff_with_exceptions
     async def get_lookml_dimensions(
         self, model: str, explore: str
     ) -> List[Dict[str, Any]]:
-        """Gets all dimensions for an explore from the LookmlModel endpoint."""
+        """Gets all dimensions for an explore from the LookmlModel endpoint.
+
+        Like `get_lookml_models`, the response is cached until the workspace or
+        branch changes. If a cache directory is configured and the LookML revision
+        is known, the response is also persisted for later runs.
+        """
+        cache_key = ("lookml_dimensions", self.workspace, model, explore)
+        if cache_key in self._state_cache:
+            logger.debug(f"Using cached dimensions for explore {model}/{explore}")
+            return self._state_cache[cache_key]  # type: ignore[no-any-return]
+
+        dimensions: List[Dict[str, Any]]
+        cache_path = self._disk_cache_path("lookml_dimensions", model, explore)
+        if cache_path is not None:
+            try:
+                dimensions = orjson.loads(cache_path.read_bytes())
+            except (OSError, orjson.JSONDecodeError):
+                # Missing or unreadable files are a cache miss and get rewritten
+                pass
+            else:
+                logger.debug(
+                    f"Loaded dimensions for explore {model}/{explore} from disk"
+                )
+                self._state_cache[cache_key] = dimensions
+                return dimensions
+
         logger.debug(f"Getting all dimensions from explore {model}/{explore}")
         params = {"fields": ["fields"]}
         url = utils.compose_url(
@@ -719,7 +943,12 @@ class LookerClient:
                 response=response,
             ) from error
 
-        return response.json()["fields"]["dimensions"]  # type: ignore[no-any-return]
+        explore_fields = orjson.loads(response.content)["fields"]
+        dimensions = explore_fields["dimensions"]
+        self._state_cache[cache_key] = dimensions
+        if cache_path is not None:
+            self._write_disk_cache(cache_path, orjson.dumps(dimensions))
+        return dimensions
 
     @cached(cache=Cache.MEMORY, serializer=serializers.PickleSerializer())  # type: ignore
     @backoff_with_exceptions
@@ -761,7 +990,13 @@ class LookerClient:
             params["fields"] = fields
 
         url = utils.compose_url(self.api_url, path=["queries"], params=params)
-        response = await self.post(url=url, json=body, timeout=TIMEOUT_SEC)
+        # The body lists every dimension in the chunk, so encode it with orjson
+        response = await self.post(
+            url=url,
+            content=orjson.dumps(body),
+            headers={"Content-Type": "application/json"},
+            timeout=TIMEOUT_SEC,
+        )
         try:
             response.raise_for_status()
         except httpx.HTTPStatusError as error:
@@ -7,10 +7,15 @@ from spectacles.client import LookerClient
 from spectacles.exceptions import LookMlNotFound, ValidationError
 from spectacles.logger import GLOBAL_LOGGER as logger
 from spectacles.models import JsonDict, SkipReason
-from spectacles.project_select import is_selected
+from spectacles.project_select import CompiledSelector
+
+_IGNORE_PATTERN = re.compile(r"spectacles\s*:\s*ignore", re.IGNORECASE)
 
 
 class LookMlObject:
+    # Large projects can have tens of thousands of dimensions, so subclasses declare
+    # their attributes in __slots__ rather than carrying a __dict__ per instance
+    __slots__ = ()
     name: str
 
     def __repr__(self) -> str:
@@ -26,6 +31,21 @@ class LookMlObject:
 
 
 class Dimension(LookMlObject):
+    __slots__ = (
+        "name",
+        "model_name",
+        "explore_name",
+        "type",
+        "tags",
+        "sql",
+        "relative_url",
+        "base_url",
+        "is_hidden",
+        "ignore",
+        "errors",
+        "_queried",
+    )
+
     def __init__(
         self,
         name: str,
@@ -36,6 +56,7 @@ class Dimension(LookMlObject):
         sql: str,
         is_hidden: bool,
         url: Optional[str] = None,
+        base_url: str = "",
     ):
         self.name = name
         self.model_name = model_name
@@ -43,18 +64,15 @@ class Dimension(LookMlObject):
         self.type = type
         self.tags = tags
         self.sql = sql
-        self.url = url
+        # The full URL is only needed to display errors, so it's built on access
+        self.relative_url = url
+        self.base_url = base_url
         self.is_hidden = is_hidden
         self._queried: bool = False
         self.errors: List[ValidationError] = []
 
-        if (
-            re.search(r"spectacles\s*:\s*ignore", sql, re.IGNORECASE)
-            or "spectacles: ignore" in tags
-        ):
-            self.ignore = True
-        else:
-            self.ignore = False
+        # Check the (usually empty) tags before scanning the SQL
+        self.ignore = "spectacles: ignore" in tags or bool(_IGNORE_PATTERN.search(sql))
 
     def __repr__(self) -> str:
         return (
@@ -63,6 +81,12 @@ class Dimension(LookMlObject):
             f"errored={self.errored})"
         )
 
+    @property
+    def url(self) -> Optional[str]:
+        if self.relative_url is None:
+            return None
+        return self.base_url + self.relative_url
+
     @property
     def queried(self) -> bool:
         return self._queried
@@ -107,7 +131,11 @@ class Dimension(LookMlObject):
 
     @classmethod
     def from_json(
-        cls, json_dict: Dict[str, Any], model_name: str, explore_name: str
+        cls,
+        json_dict: Dict[str, Any],
+        model_name: str,
+        explore_name: str,
+        base_url: str = "",
     ) -> "Dimension":
         name = json_dict["name"]
         type = json_dict["type"]
@@ -115,20 +143,37 @@ class Dimension(LookMlObject):
         sql = json_dict["sql"]
         url = json_dict["lookml_link"]
         is_hidden = json_dict["hidden"]
-        return cls(name, model_name, explore_name, type, tags, sql, is_hidden, url)
+        return cls(
+            name, model_name, explore_name, type, tags, sql, is_hidden, url, base_url
+        )
 
 
 class Explore(LookMlObject):
+    __slots__ = (
+        "name",
+        "model_name",
+        "dimensions",
+        "dimensions_loaded",
+        "errors",
+        "successes",
+        "skipped",
+        "_queried",
+        "_dimensions_lock",
+    )
+
     def __init__(
         self, name: str, model_name: str, dimensions: Optional[List[Dimension]] = None
     ):
         self.name = name
         self.model_name = model_name
         self.dimensions = [] if dimensions is None else dimensions
+        self.dimensions_loaded: bool = False
         self.errors: List[ValidationError] = []
         self.successes: List[JsonDict] = []
         self.skipped: Optional[SkipReason] = None
         self._queried: bool = False
+        # Created on first use so it binds to the running event loop
+        self._dimensions_lock: Optional[asyncio.Lock] = None
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, Explore):
@@ -140,6 +185,20 @@ class Explore(LookMlObject):
             and self.dimensions == other.dimensions
         )
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # The lock holds its event loop on Python 3.9, so copies and pickles
+        # leave it behind and create their own on first use
+        return {
+            slot: getattr(self, slot)
+            for slot in self.__slots__
+            if slot != "_dimensions_lock"
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        self._dimensions_lock = None
+
     @property
     def queried(self) -> bool:
         if self.dimensions:
@@ -187,6 +246,18 @@ class Explore(LookMlObject):
     def add_dimension(self, dimension: Dimension) -> None:
         self.dimensions.append(dimension)
 
+    async def get_dimensions(
+        self, client: LookerClient, ignore_hidden_fields: bool = False
+    ) -> List[Dimension]:
+        """Returns the explore's dimensions, fetching them the first time they're
+        needed. Concurrent callers share a single request."""
+        if self._dimensions_lock is None:
+            self._dimensions_lock = asyncio.Lock()
+        async with self._dimensions_lock:
+            if not self.dimensions_loaded:
+                await build_explore_dimensions(client, self, ignore_hidden_fields)
+        return self.dimensions
+
     @property
     def number_of_errors(self) -> int:
         if self.errored:
@@ -227,6 +298,8 @@ class CompiledSql:
 
 
 class Model(LookMlObject):
+    __slots__ = ("name", "project_name", "explores", "errors")
+
     def __init__(self, name: str, project_name: str, explores: List[Explore]):
         self.name = name
         self.project_name = project_name
@@ -304,6 +377,8 @@ class Model(LookMlObject):
 
 
 class Project(LookMlObject):
+    __slots__ = ("name", "models")
+
     def __init__(self, name: str, models: Sequence[Model]) -> None:
         self.name = name
         self.models = models
@@ -392,6 +467,7 @@ class Project(LookMlObject):
         errors: List[Dict[str, Any]] = []
         successes: List[Dict[str, Any]] = []
         tested = []
+        selector = CompiledSelector(filters) if filters is not None else None
 
         for model in self.models:
             # Add model level content validation errors.
@@ -400,8 +476,8 @@ class Project(LookMlObject):
             distinct_explores = set()
 
             for error in model.errors:
-                if filters is not None and not is_selected(
-                    model.name, error.explore, filters
+                if selector is not None and not selector.matches(
+                    model.name, error.explore
                 ):
                     continue
                 distinct_explores.add(error.explore)
@@ -414,10 +490,9 @@ class Project(LookMlObject):
             tested.extend(model_tested)
 
             for explore in model.explores:
-                if filters is not None and not is_selected(
+                if selector is not None and not selector.matches(
                     model.name,
-                    explore.name,
-                    filters,  # pyright: ignore[reportGeneralTypeIssues]
+                    explore.name,  # pyright: ignore[reportGeneralTypeIssues]
                 ):
                     continue
 
@@ -471,6 +546,27 @@ class Project(LookMlObject):
         return sum([model.number_of_errors for model in self.models if model.errored])
 
 
+def parse_explore_dimensions(
+    dimensions_json: Sequence[JsonDict],
+    explore: Explore,
+    base_url: str,
+    ignore_hidden_fields: bool = False,
+) -> List[Dimension]:
+    """Creates Dimension objects from an explore's dimension JSON, dropping any
+    dimensions that shouldn't be validated."""
+    dimensions: List[Dimension] = []
+    # Bind lookups outside the loop, which can run for thousands of dimensions
+    from_json = Dimension.from_json
+    add_dimension = dimensions.append
+    model_name = explore.model_name
+    explore_name = explore.name
+    for dimension_json in dimensions_json:
+        dimension = from_json(dimension_json, model_name, explore_name, base_url)
+        if not dimension.ignore and not (dimension.is_hidden and ignore_hidden_fields):
+            add_dimension(dimension)
+    return dimensions
+
+
 async def build_explore_dimensions(
     client: LookerClient,
     explore: Explore,
@@ -481,17 +577,12 @@ async def build_explore_dimensions(
         explore.model_name, explore.name
     )
 
-    dimensions: List[Dimension] = []
-    for dimension_json in dimensions_json:
-        dimension: Dimension = Dimension.from_json(
-            dimension_json, explore.model_name, explore.name
-        )
-        if dimension.url is not None:
-            dimension.url = client.base_url + dimension.url
-        if not dimension.ignore and not (dimension.is_hidden and ignore_hidden_fields):
-            dimensions.append(dimension)
-
-    explore.dimensions = dimensions
+    # Each explore is parsed as soon as its response arrives, so parsing overlaps
+    # with the requests still in flight for other explores
+    explore.dimensions = parse_explore_dimensions(
+        dimensions_json, explore, client.base_url, ignore_hidden_fields
+    )
+    explore.dimensions_loaded = True
     if len(explore.dimensions) == 0:
         logger.warning(
             f"Warning: Explore '{explore.name}' does not have any non-ignored "
@@ -512,12 +603,13 @@ async def build_project(
     if filters is None:
         filters = ["*/*"]
 
-    models = []
     fields = ["name", "project_name", "explores"]
-    for lookmlmodel in await client.get_lookml_models(fields=fields):
-        model = Model.from_json(lookmlmodel)
-        if model.project_name == name:
-            models.append(model)
+    models = [
+        Model.from_json(lookmlmodel)
+        for lookmlmodel in await client.get_lookml_models_for_project(
+            name, fields=fields
+        )
+    ]
 
     if not models:
         raise LookMlNotFound(
@@ -532,17 +624,26 @@ async def build_project(
 
     # Prune to selected explores for non-content validators
     if not include_all_explores:
+        selector = CompiledSelector(filters)
         tasks: List[asyncio.Task[Any]] = []
+        if include_dimensions:
+            # Keep the dimension fan-out within the client's connection pool
+            request_slot = asyncio.Semaphore(client.max_connections)
+
+            async def build_dimensions(explore: Explore) -> None:
+                async with request_slot:
+                    await explore.get_dimensions(client, ignore_hidden_fields)
+
         for model in models:
             model.explores = [
                 explore
                 for explore in model.explores
-                if is_selected(model.name, explore.name, filters)
+                if selector.matches(model.name, explore.name)
             ]
             if include_dimensions:
                 for explore in model.explores:
                     task = asyncio.create_task(
-                        build_explore_dimensions(client, explore, ignore_hidden_fields),
+                        build_dimensions(explore),
                         name=f"build_explore_dimensions_{explore.name}",
                     )
                     tasks.append(task)
@@ -1,5 +1,5 @@
 import re
-from typing import List
+from typing import FrozenSet, List, Pattern, Tuple
 
 from spectacles.exceptions import SpectaclesException
 
@@ -24,22 +24,52 @@ def selector_to_pattern(selector: str) -> str:
     return f"^{selector.replace('*', '.+?')}$"
 
 
-def is_selected(model: str, explore: str, filters: List[str]) -> bool:
-    if not filters:
-        raise ValueError("Filters cannot be an empty list.")
+class CompiledSelector:
+    """Matches models and explores against a list of selectors.
+
+    Each selector is parsed once up front, so matching many explores against the
+    same filters doesn't rebuild a pattern per explore. Selectors without a
+    wildcard are matched with a set lookup.
+    """
+
+    def __init__(self, filters: List[str]):
+        if not filters:
+            raise ValueError("Filters cannot be an empty list.")
+
+        self.filters = filters
+        includes = [f for f in filters if f[0] != "-"]
+        excludes = [f[1:] for f in filters if f[0] == "-"]
+        self._has_includes = bool(includes)
+        self._includes, self._include_patterns = self._compile(includes)
+        self._excludes, self._exclude_patterns = self._compile(excludes)
+
+    @staticmethod
+    def _compile(
+        selectors: List[str],
+    ) -> Tuple[FrozenSet[str], Tuple[Pattern[str], ...]]:
+        exact = []
+        patterns = []
+        for selector in selectors:
+            pattern = selector_to_pattern(selector)
+            if "*" in selector:
+                patterns.append(re.compile(pattern))
+            else:
+                exact.append(selector)
+        return frozenset(exact), tuple(patterns)
 
-    test_string = f"{model}/{explore}"
-    included = None
-    for f in filters:
+    def matches(self, model: str, explore: str) -> bool:
+        test_string = f"{model}/{explore}"
         # If it matches an exclude, stop immediately
-        if f[0] == "-":
-            if re.match(selector_to_pattern(f[1:]), test_string):
-                return False
-        elif included:
-            continue
-        elif re.match(selector_to_pattern(f), test_string):
-            included = True
-        else:
-            included = False
-
-    return included if included is not None else True
+        if test_string in self._excludes or any(
+            pattern.match(test_string) for pattern in self._exclude_patterns
+        ):
+            return False
+        elif not self._has_includes:
+            return True
+        return test_string in self._includes or any(
+            pattern.match(test_string) for pattern in self._include_patterns
+        )
+
+
+def is_selected(model: str, explore: str, filters: List[str]) -> bool:
+    return CompiledSelector(filters).matches(model, explore)
@@ -25,8 +25,11 @@ from spectacles.validators.sql import (
 )
 
 
-@dataclass
+@dataclass(frozen=True)
 class ProjectState:
+    # Snapshots of Git state in a manager's history, so immutable and without a __dict__
+    __slots__ = ("project", "workspace", "branch", "commit")
+
     project: str
     workspace: str
     branch: str
@@ -59,6 +62,8 @@ class LookerBranchManager:
         self.commit: Optional[str] = None
         self.branch: Optional[str] = None
         self.is_temp_branch: bool = False
+        # Whether the requested branch was already checked out in dev on entry
+        self.on_init_branch: bool = False
         self.use_personal_branch: bool = use_personal_branch
         self.personal_branch: Optional[str] = None
         self.import_managers: List[LookerBranchManager] = []
@@ -98,6 +103,7 @@ class LookerBranchManager:
             self.ephemeral = ephemeral
 
         self.is_temp_branch = False
+        self.on_init_branch = False
         self.import_managers = []
         return self
 
@@ -117,7 +123,11 @@ class LookerBranchManager:
                 if not self.use_personal_branch:
                     self.branch = new_branch
             else:
-                await self.client.checkout_branch(self.project, self.branch)
+                self.on_init_branch = (
+                    state.workspace == "dev" and state.branch == self.branch
+                )
+                if not self.on_init_branch:
+                    await self.client.checkout_branch(self.project, self.branch)
                 if self.remote_reset:
                     await self.client.reset_to_remote(self.project)
         # A commit was passed, so we non-destructively create a temporary branch we can
@@ -180,6 +190,8 @@ class LookerBranchManager:
                         f"Skipping project '{project}', which is already imported"
                     )
 
+        self.client.lookml_revision = self.get_lookml_revision()
+
         logger.indent(-1)
         logger.debug("")
 
@@ -213,7 +225,8 @@ class LookerBranchManager:
             await self.update_workspace("production")
         else:
             await self.update_workspace("dev")
-            await self.client.checkout_branch(self.project, self.init_state.branch)
+            if not self.on_init_branch:
+                await self.client.checkout_branch(self.project, self.init_state.branch)
 
         logger.indent(-1)
         logger.debug("")
@@ -236,6 +249,32 @@ class LookerBranchManager:
         else:
             return self.branch
 
+    def get_commits(self) -> Optional[List[str]]:
+        """Lists 'project@commit' for this project and its imports, or returns None
+        if the checked out LookML can't be pinned to commits."""
+        if self.commit is None:
+            return None
+        # A dev branch that isn't reset to a commit may have uncommitted changes
+        elif self.workspace == "dev" and not self.ephemeral:
+            return None
+        # In production, imported projects aren't checked out so their commits are
+        # unknown
+        elif self.workspace == "production" and self.imports:
+            return None
+
+        commits = [f"{self.project}@{self.commit}"]
+        for manager in self.import_managers:
+            import_commits = manager.get_commits()
+            if import_commits is None:
+                return None
+            commits.extend(import_commits)
+        return commits
+
+    def get_lookml_revision(self) -> Optional[str]:
+        """Identifies the checked out LookML across this project and its imports."""
+        commits = self.get_commits()
+        return ",".join(sorted(commits)) if commits is not None else None
+
     async def update_workspace(self, workspace: str) -> None:
         if workspace not in ("dev", "production"):
             raise ValueError("Workspace can only be set to 'dev' or 'production'")
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from typing import Any, Dict, List, Optional
 
 from spectacles.client import LookerClient
@@ -27,19 +28,21 @@ class ContentValidator:
                     self.include_folders.append(folder_id)
 
     async def validate(self, project: Project) -> List[ContentError]:
+        # Personal folders and subfolders are all found in the same folder listing
+        all_folders = (
+            await self.client.all_folders()
+            if self.exclude_personal or self.exclude_folders or self.include_folders
+            else []
+        )
         personal_folders = (
-            await self._get_personal_folders() if self.exclude_personal else []
+            self._get_personal_folders(all_folders) if self.exclude_personal else []
         )
 
-        self.excluded_folders: List[str] = personal_folders + (
-            await self._get_all_subfolders(self.exclude_folders)
-            if self.exclude_folders
-            else []
+        self.excluded_folders: List[str] = personal_folders + self._get_all_subfolders(
+            self.exclude_folders, all_folders
         )
-        self.included_folders: List[str] = (
-            await self._get_all_subfolders(self.include_folders)
-            if self.include_folders
-            else []
+        self.included_folders: List[str] = self._get_all_subfolders(
+            self.include_folders, all_folders
         )
 
         def is_folder_selected(folder_id: Optional[str]) -> bool:
@@ -78,35 +81,41 @@ class ContentValidator:
 
         return content_errors
 
-    async def _get_personal_folders(self) -> List[str]:
-        personal_folders = []
-        result = await self.client.all_folders()
-        for folder in result:
-            if folder["is_personal"] or folder["is_personal_descendant"]:
-                personal_folders.append(folder["id"])
-        return personal_folders
+    @staticmethod
+    def _get_personal_folders(all_folders: List[JsonDict]) -> List[str]:
+        return [
+            folder["id"]
+            for folder in all_folders
+            if folder["is_personal"] or folder["is_personal_descendant"]
+        ]
+
+    def _get_all_subfolders(
+        self, input_folders: List[str], all_folders: List[JsonDict]
+    ) -> List[str]:
+        if not input_folders:
+            return []
+        children: Dict[Optional[str], List[str]] = defaultdict(list)
+        for folder in all_folders:
+            children[folder["parent_id"]].append(folder["id"])
+        folder_ids = {folder["id"] for folder in all_folders}
 
-    async def _get_all_subfolders(self, input_folders: List[str]) -> List[str]:
         result = []
-        all_folders = await self.client.all_folders()
         for folder_id in input_folders:
-            if not any(folder["id"] == folder_id for folder in all_folders):
+            if folder_id not in folder_ids:
                 raise SpectaclesException(
                     name="folder-id-input-does-not-exist",
                     title="One of the folders input doesn't exist.",
                     detail=f"Folder {folder_id} is not a valid folder number.",
                 )
-            result.extend(self._get_subfolders(folder_id, all_folders))
+            result.extend(self._get_subfolders(folder_id, children))
         return result
 
-    def _get_subfolders(self, folder_id: str, all_folders: List[JsonDict]) -> List[str]:
+    def _get_subfolders(
+        self, folder_id: str, children: Dict[Optional[str], List[str]]
+    ) -> List[str]:
         subfolders = [folder_id]
-        children = [
-            child["id"] for child in all_folders if child["parent_id"] == folder_id
-        ]
-        if children:
-            for child in children:
-                subfolders.extend(self._get_subfolders(child, all_folders))
+        for child in children.get(folder_id, []):
+            subfolders.extend(self._get_subfolders(child, children))
         return subfolders
 
     @staticmethod
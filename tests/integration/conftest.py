@@ -1,23 +1,79 @@
-import asyncio
+import copy
 import os
-from typing import AsyncIterable
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Tuple
 
 import httpx
 import pytest
+import pytest_asyncio
+from pytest_asyncio import is_async_test
 
-from spectacles.client import LookerClient
+from spectacles.client import LookerClient, create_async_client
+from spectacles.lookml import Project, build_project
+from tests.utils import ProjectBuilder
+
+
+def pytest_collection_modifyitems(items: List[pytest.Item]) -> None:
+    # Integration tests run on the session's event loop so they can share the
+    # session-scoped Looker client and its open connections
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    integration_dir = Path(__file__).parent
+    for item in items:
+        if is_async_test(item) and integration_dir in item.path.parents:
+            item.add_marker(session_loop, append=False)
+
+
+# Integration fixtures run on the session's event loop, which owns the shared
+# client's open connections. Unit tests keep the default function loop.
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_client() -> AsyncIterator[httpx.AsyncClient]:
+    async with create_async_client() as async_client:
+        yield async_client
+
+
+@pytest.fixture(scope="session")
+def looker_client(async_client: httpx.AsyncClient) -> LookerClient:
+    return LookerClient(
+        async_client=async_client,
+        base_url="https://spectacles.looker.com",
+        client_id=os.environ.get("LOOKER_CLIENT_ID", ""),
+        client_secret=os.environ.get("LOOKER_CLIENT_SECRET", ""),
+    )
+
+
+@pytest_asyncio.fixture(autouse=True, loop_scope="session")
+async def production_workspace(looker_client: LookerClient) -> None:
+    """Starts every test in the production workspace of the shared client."""
+    await looker_client.update_workspace("production")
+
+
+@pytest.fixture(scope="session")
+def project_cache() -> Dict[Tuple[Any, ...], Project]:
+    return {}
 
 
 @pytest.fixture
-async def looker_client(
-    event_loop: asyncio.AbstractEventLoop,
-) -> AsyncIterable[LookerClient]:
-    async with httpx.AsyncClient(trust_env=False) as async_client:
-        client = LookerClient(
-            async_client=async_client,
-            base_url="https://spectacles.looker.com",
-            client_id=os.environ.get("LOOKER_CLIENT_ID", ""),
-            client_secret=os.environ.get("LOOKER_CLIENT_SECRET", ""),
+def built_project(
+    looker_client: LookerClient, project_cache: Dict[Tuple[Any, ...], Project]
+) -> ProjectBuilder:
+    """Builds each distinct project once per session.
+
+    Tests get a deep copy, since validators record their results on the project.
+    Copies leave each explore's dimensions lock behind, so a project built with
+    dimensions can still be copied on Python 3.9.
+    """
+
+    async def build(name: str, filters: List[str], **kwargs: Any) -> Project:
+        key = (
+            looker_client.workspace,
+            name,
+            tuple(filters),
+            tuple(sorted(kwargs.items())),
         )
-        await client.update_workspace("production")
-        yield client
+        if key not in project_cache:
+            project_cache[key] = await build_project(
+                looker_client, name=name, filters=filters, **kwargs
+            )
+        return copy.deepcopy(project_cache[key])
+
+    return build
@@ -1,124 +1,146 @@
+import asyncio
+import base64
 import os
-from typing import Iterable
-from unittest.mock import AsyncMock, MagicMock, patch
+from typing import AsyncIterator, Optional
+from unittest.mock import AsyncMock
 
 import pytest
-from github import Github as GitHub
-from github.Repository import Repository
+import pytest_asyncio
+from githubkit import GitHub, TokenAuthStrategy
+from githubkit.versions.latest.models import ContentFile
 
 from spectacles.client import LookerClient
 from spectacles.runner import LookerBranchManager
 
+# These tests change the Looker user's branches, so under pytest-xdist they share a
+# worker with the other modules that do
+pytestmark = pytest.mark.xdist_group("looker_git_state")
+
 LOOKER_PROJECT = "eye_exam"
-TMP_REMOTE_BRANCH = "pytest-tmp"
+# The dev branch the user starts out on in most tests
+STARTING_BRANCH = "pytest"
+REMOTE_OWNER = "spectacles-ci"
+REMOTE_REPO = "eye-exam"
+# Suffixed with the xdist worker so parallel runs don't collide on the remote
+TMP_REMOTE_BRANCH = f"pytest-tmp-{os.environ.get('PYTEST_XDIST_WORKER', 'master')}"
+
+
+def forget_branch_state(looker_client: LookerClient) -> None:
+    """Makes the next branch lookups query Looker rather than the client's cache."""
+    looker_client._clear_state_cache()
+
+
+@pytest.fixture(autouse=True)
+def patch_branch_manager(
+    monkeypatch: pytest.MonkeyPatch, request: pytest.FixtureRequest
+) -> None:
+    """Fixes temp branch names and, unless marked, skips project imports."""
+    monkeypatch.setattr("spectacles.runner.time_hash", lambda: "abc123")
+    if "project_imports" not in request.keywords:
+        monkeypatch.setattr(
+            LookerBranchManager, "get_project_imports", AsyncMock(return_value=[])
+        )
 
 
-@pytest.fixture(scope="module")
-def remote_repo() -> Iterable[Repository]:
-    access_token = os.environ["GITHUB_ACCESS_TOKEN"]
-    client = GitHub(access_token)
-    repo = client.get_repo("spectacles-ci/eye-exam")
-    yield repo
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def github() -> AsyncIterator[GitHub[TokenAuthStrategy]]:
+    async with GitHub(os.environ["GITHUB_ACCESS_TOKEN"]) as github:
+        yield github
 
 
-@pytest.fixture(scope="module", autouse=True)
-def test_remote_branch(remote_repo: Repository) -> Iterable[None]:
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def remote_branch(github: GitHub[TokenAuthStrategy]) -> AsyncIterator[str]:
     """Creates a test branch off master, waits for test execution, then cleans up."""
-    branch = remote_repo.get_branch("master")
-    remote_repo.create_git_ref(
-        ref=f"refs/heads/{TMP_REMOTE_BRANCH}", sha=branch.commit.sha
+    response = await github.rest.repos.async_get_branch(
+        REMOTE_OWNER, REMOTE_REPO, "master"
+    )
+    await github.rest.git.async_create_ref(
+        REMOTE_OWNER,
+        REMOTE_REPO,
+        ref=f"refs/heads/{TMP_REMOTE_BRANCH}",
+        sha=response.parsed_data.commit.sha,
+    )
+    yield TMP_REMOTE_BRANCH
+    await github.rest.git.async_delete_ref(
+        REMOTE_OWNER, REMOTE_REPO, f"heads/{TMP_REMOTE_BRANCH}"
     )
-    yield
-    remote_repo.get_git_ref(f"heads/{TMP_REMOTE_BRANCH}").delete()
-
 
-@patch("spectacles.runner.LookerBranchManager.get_project_imports", return_value=[])
-async def test_should_return_to_initial_state_prod(
-    mock_get_imports: AsyncMock, looker_client: LookerClient
-) -> None:
-    # Set up starting branch and workspace
-    await looker_client.update_workspace("production")
 
-    manager = LookerBranchManager(looker_client, LOOKER_PROJECT)
-    async with manager(ref="pytest"):
-        assert manager.init_state.workspace == "production"
-        workspace = await looker_client.get_workspace()
-    assert workspace == "dev"
-    workspace = await looker_client.get_workspace()
-    assert workspace == "production"
+@pytest_asyncio.fixture(loop_scope="session")
+async def dev_branch_manager(looker_client: LookerClient) -> LookerBranchManager:
+    """Puts the user on the starting branch in dev and returns a manager to test."""
+    await looker_client.update_workspace("dev")
+    await looker_client.checkout_branch(LOOKER_PROJECT, STARTING_BRANCH)
+    return LookerBranchManager(looker_client, LOOKER_PROJECT)
 
 
-@patch("spectacles.runner.LookerBranchManager.get_project_imports", return_value=[])
-async def test_should_return_to_initial_state_dev(
-    mock_get_imports: AsyncMock, looker_client: LookerClient
+@pytest.mark.parametrize(
+    "workspace,ref,other_workspace",
+    [("production", "pytest", "dev"), ("dev", None, "production")],
+)
+async def test_should_return_to_initial_state(
+    looker_client: LookerClient,
+    workspace: str,
+    ref: Optional[str],
+    other_workspace: str,
 ) -> None:
     # Set up starting branch and workspace
-    await looker_client.update_workspace("dev")
+    await looker_client.update_workspace(workspace)
 
     manager = LookerBranchManager(looker_client, LOOKER_PROJECT)
-    async with manager():
-        assert manager.init_state.workspace == "dev"
-        workspace = await looker_client.get_workspace()
-    assert workspace == "production"
-    workspace = await looker_client.get_workspace()
-    assert workspace == "dev"
+    async with manager(ref=ref):
+        assert manager.init_state.workspace == workspace
+        assert await looker_client.get_workspace() == other_workspace
+    assert await looker_client.get_workspace() == workspace
 
 
-@patch("spectacles.runner.LookerBranchManager.get_project_imports", return_value=[])
 async def test_manage_current_branch(
-    mock_get_imports: AsyncMock, looker_client: LookerClient
+    looker_client: LookerClient,
+    dev_branch_manager: LookerBranchManager,
 ) -> None:
     """User is on branch A, checkout branch A and test.
 
     The manager should not perform any branch checkouts, just test.
 
     """
-    # Set up starting branch and workspace
-    await looker_client.update_workspace("dev")
-    branch = "pytest"
-    await looker_client.checkout_branch(LOOKER_PROJECT, branch)
-
-    manager = LookerBranchManager(looker_client, LOOKER_PROJECT)
-    await manager(ref=branch).__aenter__()
-    assert manager.init_state.branch == branch
-    active_branch = await looker_client.get_active_branch_name(LOOKER_PROJECT)
-    assert active_branch == branch
-    await manager.__aexit__()
+    branch = STARTING_BRANCH
+    manager = dev_branch_manager
+    async with manager(ref=branch):
+        assert manager.init_state.branch == branch
+        active_branch = await looker_client.get_active_branch_name(LOOKER_PROJECT)
+        assert active_branch == branch
+    forget_branch_state(looker_client)
     active_branch = await looker_client.get_active_branch_name(LOOKER_PROJECT)
     assert active_branch == branch
 
 
-@patch("spectacles.runner.LookerBranchManager.get_project_imports", return_value=[])
 async def test_manage_other_branch(
-    mock_get_imports: AsyncMock, looker_client: LookerClient
+    looker_client: LookerClient,
+    dev_branch_manager: LookerBranchManager,
 ) -> None:
     """User is on branch A, checkout branch B and test.
 
     The manager should checkout branch B, test, then checkout branch A.
 
     """
-    # Set up starting branch and workspace
-    await looker_client.update_workspace("dev")
-    starting_branch = "pytest"
-    await looker_client.checkout_branch(LOOKER_PROJECT, starting_branch)
+    starting_branch = STARTING_BRANCH
 
     new_branch = "pytest-additional"
     assert new_branch != starting_branch
-    manager = LookerBranchManager(looker_client, LOOKER_PROJECT)
+    manager = dev_branch_manager
 
-    await manager(ref=new_branch).__aenter__()
-    assert manager.init_state.branch == starting_branch
-    active_branch = await looker_client.get_active_branch_name(LOOKER_PROJECT)
-    assert active_branch == new_branch
-    await manager.__aexit__()
+    async with manager(ref=new_branch):
+        assert manager.init_state.branch == starting_branch
+        active_branch = await looker_client.get_active_branch_name(LOOKER_PROJECT)
+        assert active_branch == new_branch
+    forget_branch_state(looker_client)
     active_branch = await looker_client.get_active_branch_name(LOOKER_PROJECT)
     assert active_branch == starting_branch
 
 
-@patch("spectacles.runner.LookerBranchManager.get_project_imports", return_value=[])
-@patch("spectacles.runner.time_hash", return_value="abc123")
 async def test_manage_current_branch_with_ref(
-    mock_time_hash: MagicMock, mock_get_imports: AsyncMock, looker_client: LookerClient
+    looker_client: LookerClient,
+    dev_branch_manager: LookerBranchManager,
 ) -> None:
     """User is on branch A, checkout branch A with a commit ref and test.
 
@@ -126,33 +148,32 @@ async def test_manage_current_branch_with_ref(
     branch, test, checkout branch A, and delete the temp branch.
 
     """
-    # Set up starting branch and workspace
-    await looker_client.update_workspace("dev")
-    starting_branch = "pytest"
-    await looker_client.checkout_branch(LOOKER_PROJECT, starting_branch)
+    starting_branch = STARTING_BRANCH
     commit = "e2d21d"
 
-    manager = LookerBranchManager(looker_client, LOOKER_PROJECT)
+    manager = dev_branch_manager
 
-    await manager(ref=commit).__aenter__()
-    assert manager.init_state.branch == starting_branch
-    assert manager.is_temp_branch
-    temp_branch = manager.branch
-    branch_info = await looker_client.get_active_branch(LOOKER_PROJECT)
-    assert branch_info["name"] == temp_branch
-    assert branch_info["ref"][:6] == commit
-    await manager.__aexit__()
-    branch_info = await looker_client.get_active_branch(LOOKER_PROJECT)
+    async with manager(ref=commit):
+        assert manager.init_state.branch == starting_branch
+        assert manager.is_temp_branch
+        temp_branch = manager.branch
+        branch_info = await looker_client.get_active_branch(LOOKER_PROJECT)
+        assert branch_info["name"] == temp_branch
+        assert branch_info["ref"][:6] == commit
+    forget_branch_state(looker_client)
+    branch_info, all_branches_json = await asyncio.gather(
+        looker_client.get_active_branch(LOOKER_PROJECT),
+        looker_client.get_all_branches(LOOKER_PROJECT),
+    )
     assert branch_info["name"] == starting_branch
     assert branch_info["ref"][:6] != commit
-    all_branches_json = await looker_client.get_all_branches(LOOKER_PROJECT)
-    all_branches = [branch["name"] for branch in all_branches_json]
+    all_branches = frozenset(branch["name"] for branch in all_branches_json)
     assert temp_branch not in all_branches
 
 
-@patch("spectacles.runner.time_hash", return_value="abc123")
+@pytest.mark.project_imports
 async def test_manage_current_branch_with_import_projects(
-    mock_time_hash: MagicMock, looker_client: LookerClient
+    looker_client: LookerClient,
 ) -> None:
     """User is on branch A, checkout branch A and test.
 
@@ -167,17 +188,18 @@ async def test_manage_current_branch_with_import_projects(
 
     manager = LookerBranchManager(looker_client, LOOKER_PROJECT)
 
-    await manager().__aenter__()
-    assert not manager.is_temp_branch
-    starting_branch = await looker_client.get_active_branch_name(LOOKER_PROJECT)
-    await manager.__aexit__()
+    async with manager():
+        assert not manager.is_temp_branch
+        starting_branch = await looker_client.get_active_branch_name(LOOKER_PROJECT)
+    forget_branch_state(looker_client)
     active_branch = await looker_client.get_active_branch_name(LOOKER_PROJECT)
     assert active_branch == starting_branch
 
 
-@patch("spectacles.runner.time_hash", return_value="abc123")
+@pytest.mark.project_imports
 async def test_manage_other_branch_with_import_projects(
-    mock_time_hash: MagicMock, looker_client: LookerClient
+    looker_client: LookerClient,
+    dev_branch_manager: LookerBranchManager,
 ) -> None:
     """User is on branch A, checkout branch B and test.
 
@@ -187,40 +209,38 @@ async def test_manage_other_branch_with_import_projects(
     in the dependent project, and clean it up at the end.
 
     """
-    # Set up starting branch and workspace
-    await looker_client.update_workspace("dev")
-    starting_branch = "pytest"
-    await looker_client.checkout_branch(LOOKER_PROJECT, starting_branch)
+    starting_branch = STARTING_BRANCH
     dependent_project = "looker-demo"
 
     new_branch = "pytest-additional"
     assert new_branch != starting_branch
-    manager = LookerBranchManager(looker_client, LOOKER_PROJECT)
-
-    await manager(ref=new_branch).__aenter__()
-    assert manager.init_state.branch == starting_branch
-    assert not manager.is_temp_branch
-    dependent_project_manager = manager.import_managers[0]
-    assert dependent_project_manager.is_temp_branch
-    temp_branch = dependent_project_manager.branch
-    active_branch = await looker_client.get_active_branch_name(LOOKER_PROJECT)
-    assert active_branch == new_branch
-    active_branch = await looker_client.get_active_branch_name(dependent_project)
-    assert active_branch == temp_branch
-    await manager.__aexit__()
-    active_branch = await looker_client.get_active_branch_name(LOOKER_PROJECT)
+    manager = dev_branch_manager
+
+    async with manager(ref=new_branch):
+        assert manager.init_state.branch == starting_branch
+        assert not manager.is_temp_branch
+        dependent_project_manager = manager.import_managers[0]
+        assert dependent_project_manager.is_temp_branch
+        temp_branch = dependent_project_manager.branch
+        active_branch, dependent_branch = await asyncio.gather(
+            looker_client.get_active_branch_name(LOOKER_PROJECT),
+            looker_client.get_active_branch_name(dependent_project),
+        )
+        assert active_branch == new_branch
+        assert dependent_branch == temp_branch
+    forget_branch_state(looker_client)
+    active_branch, dependent_branch, all_branches_json = await asyncio.gather(
+        looker_client.get_active_branch_name(LOOKER_PROJECT),
+        looker_client.get_active_branch_name(dependent_project),
+        looker_client.get_all_branches(dependent_project),
+    )
     assert active_branch == starting_branch
-    active_branch = await looker_client.get_active_branch_name(dependent_project)
-    assert active_branch == dependent_project_manager.init_state.branch
-    all_branches_json = await looker_client.get_all_branches(dependent_project)
-    all_branches = [branch["name"] for branch in all_branches_json]
+    assert dependent_branch == dependent_project_manager.init_state.branch
+    all_branches = frozenset(branch["name"] for branch in all_branches_json)
     assert temp_branch not in all_branches
 
 
-@patch("spectacles.runner.LookerBranchManager.get_project_imports", return_value=[])
-async def test_manage_prod_with_advanced_deploy(
-    mock_get_imports: AsyncMock, looker_client: LookerClient
-) -> None:
+async def test_manage_prod_with_advanced_deploy(looker_client: LookerClient) -> None:
     # Set up starting branch and workspace
     project = "spectacles-advanced-deploy"
     await looker_client.update_workspace("production")
@@ -235,10 +255,9 @@ async def test_manage_prod_with_advanced_deploy(
     assert workspace == "production"
 
 
-@patch("spectacles.runner.time_hash", return_value="abc123")
-async def test_manage_with_ref_import_projects(
-    mock_time_hash: MagicMock, looker_client: LookerClient
-) -> None:
+@pytest.mark.slow
+@pytest.mark.project_imports
+async def test_manage_with_ref_import_projects(looker_client: LookerClient) -> None:
     """User is on branch A, checkout branch B and test.
 
     The manager should create a new temp branch based on branch B, checkout the temp
@@ -261,12 +280,18 @@ async def test_manage_with_ref_import_projects(
         assert manager.init_state.workspace == "production"
         assert manager.is_temp_branch
         assert manager.commit and manager.commit[:6] == commit
-        branch_info = await looker_client.get_active_branch(manager.project)
+        branch_info, *import_branches = await asyncio.gather(
+            looker_client.get_active_branch(manager.project),
+            *(
+                looker_client.get_active_branch_name(import_manager.project)
+                for import_manager in manager.import_managers
+            ),
+        )
         assert branch_info["ref"][:6] == commit
-        for import_manager in manager.import_managers:
-            branch = await looker_client.get_active_branch_name(import_manager.project)
+        for import_manager, branch in zip(manager.import_managers, import_branches):
             assert import_manager.branch == branch
 
+    forget_branch_state(looker_client)
     branch_info = await looker_client.get_active_branch(LOOKER_PROJECT)
     assert branch_info["ref"][:6] != commit
 
@@ -280,28 +305,33 @@ async def test_manage_with_ref_import_projects(
     assert temp_branches.isdisjoint(all_branches)
 
 
-@patch("spectacles.runner.LookerBranchManager.get_project_imports", return_value=[])
-@patch("spectacles.runner.time_hash", return_value="abc123")
+@pytest.mark.slow
+@pytest.mark.writes_remote
 async def test_manage_with_ref_not_present_in_local_repo(
-    mock_time_hash: MagicMock,
-    mock_get_imports: AsyncMock,
-    remote_repo: Repository,
+    github: GitHub[TokenAuthStrategy],
+    remote_branch: str,
     looker_client: LookerClient,
 ) -> None:
     # Create a commit on an external branch directly on the GitHub remote
-    content_file = remote_repo.get_contents("README.md", ref="master")
+    response = await github.rest.repos.async_get_content(
+        REMOTE_OWNER, REMOTE_REPO, "README.md", ref="master"
+    )
+    content_file = response.parsed_data
 
-    if isinstance(content_file, list):
+    if not isinstance(content_file, ContentFile):
         raise TypeError(f"Expected a single ContentFile, got {type(content_file)}")
 
-    result = remote_repo.update_file(
+    result = await github.rest.repos.async_create_or_update_file_contents(
+        REMOTE_OWNER,
+        REMOTE_REPO,
         content_file.path,
         message="Updating file",
-        content=".",
+        content=base64.b64encode(b".").decode(),
         sha=content_file.sha,
-        branch=TMP_REMOTE_BRANCH,
+        branch=remote_branch,
     )
-    commit = result["commit"].sha
+    commit = result.parsed_data.commit.sha
+    assert isinstance(commit, str)
 
     manager = LookerBranchManager(looker_client, LOOKER_PROJECT)
     async with manager(ref=commit):
@@ -7,27 +7,29 @@ from spectacles.client import LookerClient
 from spectacles.exceptions import LookerApiError, SpectaclesException
 
 
-async def test_bad_authentication_request_should_raise_looker_api_error() -> None:
-    async with httpx.AsyncClient(trust_env=False) as async_client:
-        with pytest.raises(LookerApiError):
-            LookerClient(
-                async_client=async_client,
-                base_url="https://spectacles.looker.com",
-                client_id=os.environ["LOOKER_CLIENT_ID"],
-                client_secret="xxxxxxxxxxxxxx",
-            )
-
-
-async def test_unsupported_api_version_should_raise_error() -> None:
-    async with httpx.AsyncClient(trust_env=False) as async_client:
-        with pytest.raises(SpectaclesException):
-            LookerClient(
-                async_client=async_client,
-                base_url="https://spectacles.looker.com",
-                client_id=os.environ["LOOKER_CLIENT_ID"],
-                client_secret=os.environ["LOOKER_CLIENT_SECRET"],
-                api_version=3.0,
-            )
+async def test_bad_authentication_request_should_raise_looker_api_error(
+    async_client: httpx.AsyncClient,
+) -> None:
+    with pytest.raises(LookerApiError):
+        LookerClient(
+            async_client=async_client,
+            base_url="https://spectacles.looker.com",
+            client_id=os.environ["LOOKER_CLIENT_ID"],
+            client_secret="xxxxxxxxxxxxxx",
+        )
+
+
+async def test_unsupported_api_version_should_raise_error(
+    async_client: httpx.AsyncClient,
+) -> None:
+    with pytest.raises(SpectaclesException):
+        LookerClient(
+            async_client=async_client,
+            base_url="https://spectacles.looker.com",
+            client_id=os.environ["LOOKER_CLIENT_ID"],
+            client_secret=os.environ["LOOKER_CLIENT_SECRET"],
+            api_version=3.0,
+        )
 
 
 async def test_create_query_with_dimensions_should_return_certain_fields(
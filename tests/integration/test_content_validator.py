@@ -1,11 +1,12 @@
 from typing import List, Tuple
 
 import pytest
+import pytest_asyncio
 
 from spectacles.client import LookerClient
 from spectacles.exceptions import ContentError, SpectaclesException
-from spectacles.lookml import build_project
 from spectacles.validators import ContentValidator
+from tests.utils import ProjectBuilder
 
 
 @pytest.fixture
@@ -13,18 +14,18 @@ def validator(looker_client: LookerClient) -> ContentValidator:
     return ContentValidator(looker_client, exclude_personal=True)
 
 
-@pytest.fixture(params=["no_errors", "errors"])
+@pytest_asyncio.fixture(params=["no_errors", "errors"], loop_scope="session")
 async def validation_result(
-    request: pytest.FixtureRequest, validator: ContentValidator
+    request: pytest.FixtureRequest,
+    validator: ContentValidator,
+    built_project: ProjectBuilder,
 ) -> Tuple[ContentError, ...]:
     if request.param == "no_errors":
         explore_name = "users"
     else:
         explore_name = "users__fail"
 
-    project = await build_project(
-        validator.client, name="eye_exam", filters=[f"eye_exam/{explore_name}"]
-    )
+    project = await built_project("eye_exam", [f"eye_exam/{explore_name}"])
     errors = tuple(await validator.validate(project))
     return errors
 
@@ -43,80 +44,55 @@ def test_correct_number_of_errors_returned(
         assert "personal" not in titles
 
 
-async def test_error_from_excluded_folder_should_be_ignored(
-    validator: ContentValidator,
-) -> None:
-    project = await build_project(
-        validator.client, name="eye_exam", filters=["eye_exam/users__fail"]
-    )
-    validator.exclude_folders.append("26")
-    validation_result: List[ContentError] = await validator.validate(project)
-    assert len(validation_result) == 0
-
-
-async def test_error_from_included_folder_should_be_returned(
+@pytest.mark.parametrize(
+    "include_folders,exclude_folders,expected_errors",
+    [([], ["26"], 0), (["26"], [], 2), (["26"], ["26"], 0)],
+    ids=["excluded", "included", "exclude_takes_priority"],
+)
+async def test_folder_selection_should_filter_errors(
     validator: ContentValidator,
+    built_project: ProjectBuilder,
+    include_folders: List[str],
+    exclude_folders: List[str],
+    expected_errors: int,
 ) -> None:
-    project = await build_project(
-        validator.client, name="eye_exam", filters=["eye_exam/users__fail"]
-    )
-    validator.include_folders.append("26")
+    project = await built_project("eye_exam", ["eye_exam/users__fail"])
+    validator.include_folders.extend(include_folders)
+    validator.exclude_folders.extend(exclude_folders)
     validation_result: List[ContentError] = await validator.validate(project)
-    assert len(validation_result) == 2
-
-
-async def test_excluded_folder_should_take_priority_over_included_folder(
-    validator: ContentValidator,
-) -> None:
-    project = await build_project(
-        validator.client, name="eye_exam", filters=["eye_exam/users__fail"]
-    )
-    validator.include_folders.append("26")
-    validator.exclude_folders.append("26")
-    validation_result: List[ContentError] = await validator.validate(project)
-    assert len(validation_result) == 0
+    assert len(validation_result) == expected_errors
 
 
 async def test_error_from_deleted_explore_should_be_present(
-    validator: ContentValidator,
+    validator: ContentValidator, built_project: ProjectBuilder
 ) -> None:
-    filters = ["eye_exam/*"]
-    project = await build_project(
-        validator.client,
-        name="eye_exam",
-        filters=filters,
-        include_all_explores=True,
-    )
+    project = await built_project("eye_exam", ["eye_exam/*"], include_all_explores=True)
     content_errors = await validator.validate(project)
     titles = [error.metadata["title"] for error in content_errors]
     assert "Users [from deleted explore]" in titles
 
 
 async def test_non_existing_excluded_folder_should_raise_exception(
-    looker_client: LookerClient,
+    looker_client: LookerClient, built_project: ProjectBuilder
 ) -> None:
     validator = ContentValidator(
         looker_client,
         exclude_personal=True,
         folders=["-9999"],
     )
-    project = await build_project(
-        validator.client, name="eye_exam", filters=["eye_exam/users"]
-    )
+    project = await built_project("eye_exam", ["eye_exam/users"])
     with pytest.raises(SpectaclesException):
         await validator.validate(project)
 
 
 async def test_non_existing_included_folder_should_raise_exception(
-    looker_client: LookerClient,
+    looker_client: LookerClient, built_project: ProjectBuilder
 ) -> None:
     validator = ContentValidator(
         looker_client,
         exclude_personal=True,
         folders=["9999"],
     )
-    project = await build_project(
-        validator.client, name="eye_exam", filters=["eye_exam/users"]
-    )
+    project = await built_project("eye_exam", ["eye_exam/users"])
     with pytest.raises(SpectaclesException):
         await validator.validate(project)
@@ -1,36 +1,38 @@
 from typing import List, Tuple
 
 import pytest
+import pytest_asyncio
 
 from spectacles.client import LookerClient
 from spectacles.exceptions import DataTestError, SpectaclesException
 from spectacles.lookml import build_project
 from spectacles.validators import DataTestValidator
 from spectacles.validators.data_test import DataTest
+from tests.utils import ProjectBuilder
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def validator(looker_client: LookerClient) -> DataTestValidator:
     return DataTestValidator(looker_client)
 
 
-@pytest.fixture(params=["no_errors", "errors"])
+@pytest_asyncio.fixture(params=["no_errors", "errors"], loop_scope="session")
 async def tests(
-    request: pytest.FixtureRequest, validator: DataTestValidator
+    request: pytest.FixtureRequest,
+    validator: DataTestValidator,
+    built_project: ProjectBuilder,
 ) -> List[DataTest]:
     if request.param == "no_errors":
         explore_name = "users"
     else:
         explore_name = "users__fail"
 
-    project = await build_project(
-        validator.client, name="eye_exam", filters=[f"eye_exam/{explore_name}"]
-    )
+    project = await built_project("eye_exam", [f"eye_exam/{explore_name}"])
     tests = await validator.get_tests(project)
     return tests
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(loop_scope="session")
 async def validation_result(
     validator: DataTestValidator, tests: List[DataTest]
 ) -> Tuple[DataTestError, ...]:
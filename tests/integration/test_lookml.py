@@ -3,17 +3,15 @@ import pytest
 from spectacles.client import LookerClient
 from spectacles.exceptions import SpectaclesException
 from spectacles.lookml import Explore, build_explore_dimensions, build_project
+from tests.utils import ProjectBuilder
 
 
 class TestBuildProject:
     async def test_model_explore_dimension_counts_should_match(
-        self, looker_client: LookerClient
+        self, built_project: ProjectBuilder
     ) -> None:
-        project = await build_project(
-            looker_client,
-            name="eye_exam",
-            filters=["eye_exam/users"],
-            include_dimensions=True,
+        project = await built_project(
+            "eye_exam", ["eye_exam/users"], include_dimensions=True
         )
         assert len(project.models) == 1
         assert len(project.models[0].explores) == 1
@@ -24,28 +22,23 @@ class TestBuildProject:
         assert project.queried is False
 
     async def test_project_with_everything_excluded_should_not_have_models(
-        self, looker_client: LookerClient
+        self, built_project: ProjectBuilder
     ) -> None:
-        project = await build_project(
-            looker_client, name="eye_exam", filters=["-eye_exam/*"]
-        )
+        project = await built_project("eye_exam", ["-eye_exam/*"])
         assert len(project.models) == 0
 
     async def test_duplicate_selectors_should_be_deduplicated(
-        self, looker_client: LookerClient
+        self, built_project: ProjectBuilder
     ) -> None:
-        project = await build_project(
-            looker_client, name="eye_exam", filters=["eye_exam/users", "eye_exam/users"]
-        )
+        project = await built_project("eye_exam", ["eye_exam/users", "eye_exam/users"])
         assert len(project.models) == 1
 
     async def test_hidden_dimension_should_be_excluded_with_ignore_hidden(
-        self, looker_client: LookerClient
+        self, built_project: ProjectBuilder
     ) -> None:
-        project = await build_project(
-            looker_client,
-            name="eye_exam",
-            filters=["eye_exam/users"],
+        project = await built_project(
+            "eye_exam",
+            ["eye_exam/users"],
             include_dimensions=True,
             ignore_hidden_fields=True,
         )
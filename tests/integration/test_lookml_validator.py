@@ -3,8 +3,11 @@ import pytest
 from spectacles.client import LookerClient
 from spectacles.validators import LookMLValidator
 
+# Shares a pytest-xdist worker with the other modules that change Looker branches
+pytestmark = pytest.mark.xdist_group("looker_git_state")
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def validator(looker_client: LookerClient) -> LookMLValidator:
     return LookMLValidator(looker_client)
 
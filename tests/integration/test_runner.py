@@ -1,45 +1,128 @@
+import asyncio
+import itertools
 import re
-import string
-from unittest.mock import MagicMock, patch
+from typing import AsyncIterator, Iterable, Optional, Set, Tuple
 
 import pytest
+import pytest_asyncio
 
 from spectacles.client import LookerClient
+from spectacles.exceptions import LookerApiError
 from spectacles.runner import Runner
 
+# Shares a pytest-xdist worker with the other modules that change Looker branches
+pytestmark = pytest.mark.xdist_group("looker_git_state")
+
+# Temp branches made while time_hash is patched to return t0, t1, ... (never hex)
+TMP_BRANCH_PATTERN = re.compile(r"tmp_spectacles_t\d+\Z")
+PROJECTS = ("eye_exam", "looker-demo")
+
+
+async def cleanup_project_tmp_branches(
+    looker_client: LookerClient, project: str
+) -> None:
+    branches_json = await looker_client.get_all_branches(project)
+    branches = [branch["name"] for branch in branches_json]
+
+    to_delete = []
+    dev_branch = None
+    for branch in branches:
+        if not dev_branch and branch.startswith("dev"):
+            dev_branch = branch
+        elif TMP_BRANCH_PATTERN.match(branch):
+            to_delete.append(branch)
+
+    if to_delete and dev_branch:
+        # In case we're currently on a branch we want to delete
+        try:
+            await looker_client.checkout_branch(project, dev_branch)
+        except LookerApiError:
+            pass
+        # Each project is one Git repo, so its deletes would contend for its locks
+        for branch in to_delete:
+            await looker_client.delete_branch(project, branch)
+
+
+async def cleanup_tmp_branches(
+    looker_client: LookerClient, projects: Iterable[str]
+) -> None:
+    # The workspace applies to the whole session, so switch before fanning out
+    await looker_client.update_workspace("dev")
+    await asyncio.gather(
+        *(cleanup_project_tmp_branches(looker_client, project) for project in projects)
+    )
+
 
 @pytest.fixture(autouse=True)
-async def cleanup_tmp_branches(looker_client: LookerClient) -> None:
-    for project in ("eye_exam", "looker-demo"):
-        await looker_client.update_workspace("dev")
-        branches_json = await looker_client.get_all_branches(project)
-        branches = [branch["name"] for branch in branches_json]
-
-        to_delete = []
-        dev_branch = None
-        for branch in branches:
-            if not dev_branch and branch.startswith("dev"):
-                dev_branch = branch
-            elif re.match("tmp_spectacles_[a-z]$", branch):
-                to_delete.append(branch)
-
-        if to_delete and dev_branch:
-            # In case we're currently on a branch we want to delete
-            try:
-                await looker_client.checkout_branch(project, dev_branch)
-            except Exception:
-                pass
-            for branch in to_delete:
-                await looker_client.delete_branch(project, branch)
+def patch_time_hash(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Names each test's temp branches t0, t1, ... so they match the pattern."""
+    counter = itertools.count()
+    monkeypatch.setattr("spectacles.runner.time_hash", lambda: f"t{next(counter)}")
+
+
+@pytest_asyncio.fixture(scope="module", autouse=True, loop_scope="session")
+async def sweep_tmp_branches(looker_client: LookerClient) -> AsyncIterator[None]:
+    """Clears temp branches left by earlier runs, and again once the module is done."""
+    await cleanup_tmp_branches(looker_client, PROJECTS)
+    yield
+    await cleanup_tmp_branches(looker_client, PROJECTS)
+
+
+@pytest_asyncio.fixture(autouse=True, loop_scope="session")
+async def cleanup_leftover_tmp_branches(
+    looker_client: LookerClient, monkeypatch: pytest.MonkeyPatch
+) -> AsyncIterator[None]:
+    """Cleans up after a test only if it left one of its temp branches behind."""
+    leftovers: Set[Tuple[str, str]] = set()
+    create_branch = looker_client.create_branch
+    delete_branch = looker_client.delete_branch
+
+    async def tracked_create_branch(
+        project: str, branch: str, ref: Optional[str] = None
+    ) -> None:
+        await create_branch(project, branch, ref)
+        leftovers.add((project, branch))
+
+    async def tracked_delete_branch(project: str, branch: str) -> None:
+        await delete_branch(project, branch)
+        leftovers.discard((project, branch))
+
+    monkeypatch.setattr(looker_client, "create_branch", tracked_create_branch)
+    monkeypatch.setattr(looker_client, "delete_branch", tracked_delete_branch)
+    yield
+    if leftovers:
+        await cleanup_tmp_branches(looker_client, {project for project, _ in leftovers})
+
+
+@pytest.fixture(scope="module")
+def runner(looker_client: LookerClient) -> Runner:
+    """Shared by the module's tests, since each validation sets its own Git state."""
+    return Runner(looker_client, "eye_exam")
+
+
+@pytest.fixture(scope="module")
+def reset_runner(looker_client: LookerClient) -> Runner:
+    """Like `runner`, but resets checked out branches to the remote."""
+    return Runner(looker_client, "eye_exam", remote_reset=True)
+
+
+@pytest.fixture(
+    scope="module", params=[True, False], ids=["personal_branch", "temp_branch"]
+)
+def incremental_runner(
+    looker_client: LookerClient, request: pytest.FixtureRequest
+) -> Runner:
+    return Runner(
+        looker_client,
+        "eye_exam",
+        remote_reset=True,
+        use_personal_branch=request.param,
+    )
 
 
 @pytest.mark.parametrize("fail_fast", [True, False])
-@patch("spectacles.runner.time_hash", side_effect=tuple(string.ascii_lowercase))
-async def test_validate_sql_should_work(
-    mock_time_hash: MagicMock, looker_client: LookerClient, fail_fast: bool
-) -> None:
-    runner = Runner(looker_client, "eye_exam", remote_reset=True)
-    result = await runner.validate_sql(
+async def test_validate_sql_should_work(reset_runner: Runner, fail_fast: bool) -> None:
+    result = await reset_runner.validate_sql(
         ref="pytest",
         filters=["eye_exam/users", "eye_exam/users__fail"],
         fail_fast=fail_fast,
@@ -53,11 +136,7 @@ async def test_validate_sql_should_work(
         assert len(result["errors"]) > 1
 
 
-@patch("spectacles.runner.time_hash", side_effect=tuple(string.ascii_lowercase))
-async def test_validate_content_should_work(
-    mock_time_hash: MagicMock, looker_client: LookerClient
-) -> None:
-    runner = Runner(looker_client, "eye_exam")
+async def test_validate_content_should_work(runner: Runner) -> None:
     result = await runner.validate_content(
         filters=["eye_exam/users", "eye_exam/users__fail"]
     )
@@ -67,11 +146,7 @@ async def test_validate_content_should_work(
     assert len(result["errors"]) > 0
 
 
-@patch("spectacles.runner.time_hash", side_effect=tuple(string.ascii_lowercase))
-async def test_validate_data_tests_should_work(
-    mock_time_hash: MagicMock, looker_client: LookerClient
-) -> None:
-    runner = Runner(looker_client, "eye_exam")
+async def test_validate_data_tests_should_work(runner: Runner) -> None:
     result = await runner.validate_data_tests(
         filters=["eye_exam/users", "eye_exam/users__fail"]
     )
@@ -81,22 +156,14 @@ async def test_validate_data_tests_should_work(
     assert len(result["errors"]) > 0
 
 
-@pytest.mark.parametrize("use_personal_branch", [True, False])
-@patch("spectacles.runner.time_hash", side_effect=tuple(string.ascii_lowercase))
 async def test_incremental_sql_with_equal_explores_should_not_error(
-    mock_time_hash: MagicMock, looker_client: LookerClient, use_personal_branch: bool
+    incremental_runner: Runner,
 ) -> None:
     """Case where all explores compile to the same SQL.
 
     We expect all explores to be skipped, returning no errors.
     """
-    runner = Runner(
-        looker_client,
-        "eye_exam",
-        remote_reset=True,
-        use_personal_branch=use_personal_branch,
-    )
-    result = await runner.validate_sql(
+    result = await incremental_runner.validate_sql(
         incremental=True,
         ref="pytest-incremental-equal",
         filters=["eye_exam/users", "eye_exam/users__fail"],
@@ -106,22 +173,14 @@ async def test_incremental_sql_with_equal_explores_should_not_error(
     assert len(result["errors"]) == 0
 
 
-@pytest.mark.parametrize("use_personal_branch", [True, False])
-@patch("spectacles.runner.time_hash", side_effect=tuple(string.ascii_lowercase))
 async def test_incremental_sql_with_diff_explores_and_valid_sql_should_not_error(
-    mock_time_hash: MagicMock, looker_client: LookerClient, use_personal_branch: bool
+    incremental_runner: Runner,
 ) -> None:
     """Case where one explore differs in SQL and has valid SQL.
 
     We expect the differing explore to be tested and return no errors.
     """
-    runner = Runner(
-        looker_client,
-        "eye_exam",
-        remote_reset=True,
-        use_personal_branch=use_personal_branch,
-    )
-    result = await runner.validate_sql(
+    result = await incremental_runner.validate_sql(
         incremental=True,
         ref="pytest-incremental-valid-diff",
         filters=["eye_exam/users", "eye_exam/users__fail"],
@@ -135,22 +194,14 @@ async def test_incremental_sql_with_diff_explores_and_valid_sql_should_not_error
     assert len(result["errors"]) == 0
 
 
-@pytest.mark.parametrize("use_personal_branch", [True, False])
-@patch("spectacles.runner.time_hash", side_effect=tuple(string.ascii_lowercase))
 async def test_incremental_sql_with_diff_explores_and_invalid_sql_should_error(
-    mock_time_hash: MagicMock, looker_client: LookerClient, use_personal_branch: bool
+    incremental_runner: Runner,
 ) -> None:
     """Case where one explore differs in SQL and has one SQL error.
 
     We expect the differing explore to be tested and return one error.
     """
-    runner = Runner(
-        looker_client,
-        "eye_exam",
-        remote_reset=True,
-        use_personal_branch=use_personal_branch,
-    )
-    result = await runner.validate_sql(
+    result = await incremental_runner.validate_sql(
         incremental=True,
         ref="pytest-incremental-invalid-diff",
         filters=["eye_exam/users", "eye_exam/users__fail"],
@@ -164,23 +215,15 @@ async def test_incremental_sql_with_diff_explores_and_invalid_sql_should_error(
     assert len(result["errors"]) == 1
 
 
-@pytest.mark.parametrize("use_personal_branch", [True, False])
-@patch("spectacles.runner.time_hash", side_effect=tuple(string.ascii_lowercase))
 async def test_incremental_sql_with_diff_explores_and_invalid_diff_sql_should_error(
-    mock_time_hash: MagicMock, looker_client: LookerClient, use_personal_branch: bool
+    incremental_runner: Runner,
 ) -> None:
     """Case where one explore differs in SQL and has two SQL errors, one present in
     the target branch, one not present in the target branch.
 
     We expect the differing explore to be tested and return one error.
     """
-    runner = Runner(
-        looker_client,
-        "eye_exam",
-        remote_reset=True,
-        use_personal_branch=use_personal_branch,
-    )
-    result = await runner.validate_sql(
+    result = await incremental_runner.validate_sql(
         incremental=True,
         ref="pytest-incremental-invalid-equal",
         filters=["eye_exam/users", "eye_exam/users__fail"],
@@ -194,10 +237,8 @@ async def test_incremental_sql_with_diff_explores_and_invalid_diff_sql_should_er
     assert len(result["errors"]) == 1
 
 
-@pytest.mark.parametrize("use_personal_branch", [True, False])
-@patch("spectacles.runner.time_hash", side_effect=tuple(string.ascii_lowercase))
 async def test_incremental_sql_with_diff_explores_and_invalid_existing_sql_should_error(
-    mock_time_hash: MagicMock, looker_client: LookerClient, use_personal_branch: bool
+    incremental_runner: Runner,
 ) -> None:
     """Case where the target branch has many errors, one of which is fixed on the base
     branch.
@@ -205,13 +246,7 @@ async def test_incremental_sql_with_diff_explores_and_invalid_existing_sql_shoul
     We expect the differing explore to be tested and return no errors, since the
     remaining errors already exist for the target.
     """
-    runner = Runner(
-        looker_client,
-        "eye_exam",
-        remote_reset=True,
-        use_personal_branch=use_personal_branch,
-    )
-    result = await runner.validate_sql(
+    result = await incremental_runner.validate_sql(
         incremental=True,
         target="pytest-incremental-dirty-prod",
         ref="pytest-incremental-fix-prod",
@@ -227,8 +262,7 @@ async def test_incremental_sql_with_diff_explores_and_invalid_existing_sql_shoul
 
 
 async def test_validate_sql_with_query_profiler_should_work(
-    looker_client: LookerClient, caplog: pytest.LogCaptureFixture
+    runner: Runner, caplog: pytest.LogCaptureFixture
 ) -> None:
-    runner = Runner(looker_client, "eye_exam")
     await runner.validate_sql(fail_fast=True, profile=True, runtime_threshold=0)
     assert "Query profiler results" in caplog.text
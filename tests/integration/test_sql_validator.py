@@ -1,10 +1,15 @@
 from typing import Tuple
 
 import pytest
+import pytest_asyncio
 
 from spectacles.client import LookerClient
-from spectacles.lookml import Explore, build_project
+from spectacles.lookml import Explore
 from spectacles.validators.sql import SqlValidator
+from tests.utils import ProjectBuilder
+
+# Keeps these tests on one pytest-xdist worker, so they share its cached projects
+pytestmark = pytest.mark.xdist_group("sql_validator")
 
 
 @pytest.fixture
@@ -12,9 +17,11 @@ def validator(looker_client: LookerClient) -> SqlValidator:
     return SqlValidator(looker_client)
 
 
-@pytest.fixture(params=["no_sql_errors", "sql_errors"])
+@pytest_asyncio.fixture(params=["no_sql_errors", "sql_errors"], loop_scope="session")
 async def explores(
-    request: pytest.FixtureRequest, validator: SqlValidator
+    request: pytest.FixtureRequest,
+    validator: SqlValidator,
+    built_project: ProjectBuilder,
 ) -> Tuple[Explore, ...]:
     """Returns Explores from eye_exam/user after SQL validation."""
     if request.param == "no_sql_errors":
@@ -22,11 +29,8 @@ async def explores(
     else:
         explore_name = "users__fail"
 
-    project = await build_project(
-        validator.client,
-        name="eye_exam",
-        filters=[f"eye_exam/{explore_name}"],
-        include_dimensions=True,
+    project = await built_project(
+        "eye_exam", [f"eye_exam/{explore_name}"], include_dimensions=True
     )
     explores = tuple(project.iter_explores())
     await validator.search(explores, fail_fast=False)
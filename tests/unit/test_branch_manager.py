@@ -73,3 +73,49 @@ async def test_infinite_circular_project_imports_raise_an_error(
 
     with pytest.raises(SpectaclesException):
         await manager(ref="dev-branch").__aenter__()
+
+
+@patch.object(LookerBranchManager, "get_project_imports")
+async def test_lookml_revision_is_only_set_for_commit_refs(
+    get_project_imports: AsyncMock,
+) -> None:
+    get_project_imports.return_value = []
+    mock_client = MagicMock(spec=LookerClient)
+    manager = LookerBranchManager(mock_client, project="A")
+
+    await manager(ref="abc1234").__aenter__()
+    assert mock_client.lookml_revision == "A@abc1234"
+
+    # A branch checked out as-is may have uncommitted changes
+    await manager(ref="dev-branch", ephemeral=False).__aenter__()
+    assert mock_client.lookml_revision is None
+
+
+@patch.object(LookerBranchManager, "get_project_imports")
+async def test_exit_should_delete_temp_branches_in_every_imported_project(
+    get_project_imports: AsyncMock,
+) -> None:
+    # Mock calls for project A, then B, then C
+    get_project_imports.side_effect = (["B", "C"], [], [])
+    mock_client = MagicMock(spec=LookerClient)
+    manager = LookerBranchManager(mock_client, project="A")
+
+    await manager(ref="dev-branch").__aenter__()
+    await manager.__aexit__()
+    deleted = {call.args[0] for call in mock_client.delete_branch.await_args_list}
+    assert deleted == {"B", "C"}
+
+
+@patch.object(LookerBranchManager, "get_project_imports")
+async def test_manage_current_branch_should_not_check_out_any_branch(
+    get_project_imports: AsyncMock,
+) -> None:
+    get_project_imports.return_value = []
+    mock_client = MagicMock(spec=LookerClient)
+    mock_client.get_workspace.return_value = "dev"
+    mock_client.get_active_branch.return_value = {"name": "dev-branch", "ref": "abc"}
+    manager = LookerBranchManager(mock_client, project="A")
+
+    await manager(ref="dev-branch").__aenter__()
+    await manager.__aexit__()
+    mock_client.checkout_branch.assert_not_awaited()
@@ -1,17 +1,20 @@
 import logging
-from typing import Type
-from unittest.mock import AsyncMock, MagicMock, Mock, patch
+import os
+from typing import Any, Dict, Iterable, List, Tuple, Type
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
-import requests
 
 from spectacles.cli import (
+    YamlConfigAction,
     create_parser,
     handle_exceptions,
     main,
     preprocess_dash,
     process_pin_imports,
 )
+from spectacles.client import create_async_client
 from spectacles.exceptions import (
     GenericValidationError,
     LookerApiError,
@@ -22,31 +25,40 @@ from tests.utils import build_validation
 
 
 @pytest.fixture
-def clean_env(monkeypatch: pytest.MonkeyPatch) -> None:
-    for variable in ENV_VARS.keys():
-        monkeypatch.delenv(variable, raising=False)
+def clean_env() -> Iterable[None]:
+    # patch.dict snapshots os.environ once and restores it in one step afterwards
+    with patch.dict(os.environ):
+        for variable in ENV_VARS:
+            os.environ.pop(variable, None)
+        yield
 
 
 @pytest.fixture
-def env(monkeypatch: pytest.MonkeyPatch) -> None:
-    for variable, value in ENV_VARS.items():
-        monkeypatch.setenv(variable, value)
+def env() -> Iterable[None]:
+    with patch.dict(os.environ, ENV_VARS):
+        yield
 
 
 @pytest.fixture
-def limited_env(monkeypatch: pytest.MonkeyPatch) -> None:
-    for variable, value in ENV_VARS.items():
-        if variable in ["LOOKER_CLIENT_SECRET", "LOOKER_PROJECT"]:
-            monkeypatch.delenv(variable, raising=False)
-        else:
-            monkeypatch.setenv(variable, value)
+def limited_env() -> Iterable[None]:
+    with patch.dict(os.environ, ENV_VARS):
+        del os.environ["LOOKER_CLIENT_SECRET"], os.environ["LOOKER_PROJECT"]
+        yield
+
+
+@pytest.fixture
+def config_file(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+    """Stands in for the parsed YAML config file, which tests fill in."""
+    config: Dict[str, Any] = {}
+    monkeypatch.setattr(YamlConfigAction, "parse_config", lambda self, path: config)
+    return config
 
 
 @patch("sys.argv", new=["spectacles", "--help"])
 def test_help() -> None:
     with pytest.raises(SystemExit) as cm:
         main()
-        assert cm.value.code == 0
+    assert cm.value.code == 0
 
 
 @pytest.mark.parametrize(
@@ -79,15 +91,12 @@ def test_handle_exceptions_looker_error_should_log_response_and_status(
     caplog: pytest.LogCaptureFixture,
 ) -> None:
     caplog.set_level(logging.DEBUG)
-    response = Mock(spec=requests.Response)
-    response.request = Mock(spec=requests.PreparedRequest)
-    response.request.url = "https://api.looker.com"
-    response.request.method = "GET"
-    response.json.return_value = {
-        "message": "Not found",
-        "documentation_url": "http://docs.looker.com/",
-    }
     status = 404
+    response = httpx.Response(
+        status,
+        json={"message": "Not found", "documentation_url": "http://docs.looker.com/"},
+        request=httpx.Request("GET", "https://api.looker.com"),
+    )
 
     @handle_exceptions
     def raise_exception() -> None:
@@ -152,18 +161,17 @@ def test_parse_args_with_only_cli(clean_env: None) -> None:
     assert args.client_secret == "CLIENT_SECRET_CLI"
 
 
-@patch("spectacles.cli.YamlConfigAction.parse_config")
 def test_parse_args_with_only_config_file(
-    mock_parse_config: MagicMock, clean_env: None
+    config_file: Dict[str, Any], clean_env: None
 ) -> None:
     parser = create_parser()
-    mock_parse_config.return_value = {
-        "base_url": "BASE_URL_CONFIG",
-        "client_id": "CLIENT_ID_CONFIG",
-        "client_secret": "CLIENT_SECRET_CONFIG",
-        "project": "spectacles",
-        "explores": ["model_a/*", "-model_a/explore_b"],
-    }
+    config_file.update(
+        base_url="BASE_URL_CONFIG",
+        client_id="CLIENT_ID_CONFIG",
+        client_secret="CLIENT_SECRET_CONFIG",
+        project="spectacles",
+        explores=["model_a/*", "-model_a/explore_b"],
+    )
     args = parser.parse_args(["sql", "--config-file", "config.yml"])
     assert args.base_url == "BASE_URL_CONFIG"
     assert args.client_id == "CLIENT_ID_CONFIG"
@@ -171,15 +179,14 @@ def test_parse_args_with_only_config_file(
     assert args.explores == ["model_a/*", "-model_a/explore_b"]
 
 
-@patch("spectacles.cli.YamlConfigAction.parse_config")
 def test_parse_args_with_incomplete_config_file(
-    mock_parse_config: MagicMock, clean_env: None, capsys: pytest.CaptureFixture[str]
+    config_file: Dict[str, Any], clean_env: None, capsys: pytest.CaptureFixture[str]
 ) -> None:
     parser = create_parser()
-    mock_parse_config.return_value = {
-        "base_url": "BASE_URL_CONFIG",
-        "client_id": "CLIENT_ID_CONFIG",
-    }
+    config_file.update(
+        base_url="BASE_URL_CONFIG",
+        client_id="CLIENT_ID_CONFIG",
+    )
     with pytest.raises(SystemExit):
         parser.parse_args(["connect", "--config-file", "config.yml"])
     captured = capsys.readouterr()
@@ -187,17 +194,16 @@ def test_parse_args_with_incomplete_config_file(
 
 
 @patch("spectacles.cli.run_sql")
-@patch("spectacles.cli.YamlConfigAction.parse_config")
 def test_config_file_explores_folders_processed_correctly(
-    mock_parse_config: MagicMock, mock_run_sql: AsyncMock, clean_env: None
+    mock_run_sql: AsyncMock, config_file: Dict[str, Any], clean_env: None
 ) -> None:
-    mock_parse_config.return_value = {
-        "base_url": "BASE_URL_CONFIG",
-        "client_id": "CLIENT_ID_CONFIG",
-        "client_secret": "CLIENT_SECRET_CONFIG",
-        "project": "spectacles",
-        "explores": ["model_a/*", "-model_a/explore_b"],
-    }
+    config_file.update(
+        base_url="BASE_URL_CONFIG",
+        client_id="CLIENT_ID_CONFIG",
+        client_secret="CLIENT_SECRET_CONFIG",
+        project="spectacles",
+        explores=["model_a/*", "-model_a/explore_b"],
+    )
     with patch("sys.argv", ["spectacles", "sql", "--config-file", "config.yml"]):
         main()
 
@@ -254,15 +260,14 @@ def test_parse_args_with_incomplete_env_vars(
     assert "the following arguments are required: --client-secret" in captured.err
 
 
-@patch("spectacles.cli.YamlConfigAction.parse_config")
-def test_arg_precedence(mock_parse_config: MagicMock, limited_env: None) -> None:
+def test_arg_precedence(config_file: Dict[str, Any], limited_env: None) -> None:
     parser = create_parser()
     # Precedence: command line > environment variables > config files
-    mock_parse_config.return_value = {
-        "base_url": "BASE_URL_CONFIG",
-        "client_id": "CLIENT_ID_CONFIG",
-        "client_secret": "CLIENT_SECRET_CONFIG",
-    }
+    config_file.update(
+        base_url="BASE_URL_CONFIG",
+        client_id="CLIENT_ID_CONFIG",
+        client_secret="CLIENT_SECRET_CONFIG",
+    )
     args = parser.parse_args(
         ["connect", "--config-file", "config.yml", "--base-url", "BASE_URL_CLI"]
     )
@@ -277,31 +282,29 @@ def test_env_var_override_argparse_default(env: None) -> None:
     assert args.port == 8080
 
 
-@patch("spectacles.cli.YamlConfigAction.parse_config")
 def test_config_override_argparse_default(
-    mock_parse_config: MagicMock, clean_env: None
+    config_file: Dict[str, Any], clean_env: None
 ) -> None:
     parser = create_parser()
-    mock_parse_config.return_value = {
-        "base_url": "BASE_URL_CONFIG",
-        "client_id": "CLIENT_ID_CONFIG",
-        "client_secret": "CLIENT_SECRET_CONFIG",
-        "port": 8080,
-    }
+    config_file.update(
+        base_url="BASE_URL_CONFIG",
+        client_id="CLIENT_ID_CONFIG",
+        client_secret="CLIENT_SECRET_CONFIG",
+        port=8080,
+    )
     args = parser.parse_args(["connect", "--config-file", "config.yml"])
     assert args.port == 8080
 
 
-@patch("spectacles.cli.YamlConfigAction.parse_config")
 def test_bad_config_file_parameter(
-    mock_parse_config: MagicMock, clean_env: None
+    config_file: Dict[str, Any], clean_env: None
 ) -> None:
     parser = create_parser()
-    mock_parse_config.return_value = {
-        "base_url": "BASE_URL_CONFIG",
-        "api_key": "CLIENT_ID_CONFIG",
-        "port": 8080,
-    }
+    config_file.update(
+        base_url="BASE_URL_CONFIG",
+        api_key="CLIENT_ID_CONFIG",
+        port=8080,
+    )
     with pytest.raises(
         SpectaclesException, match="Invalid configuration file parameter"
     ):
@@ -340,79 +343,88 @@ def test_parse_args_with_mutually_exclusive_args_commit_ref(
     )
 
 
-@patch("sys.argv", new=["spectacles", "sql"])
-@patch("spectacles.cli.Runner")
-@patch("spectacles.cli.LookerClient", autospec=True)
-def test_main_with_sql_validator(
-    mock_client: MagicMock,
-    mock_runner: MagicMock,
-    env: None,
-    caplog: pytest.LogCaptureFixture,
-) -> None:
-    validation = build_validation("sql")
-    mock_runner.return_value.validate_sql = AsyncMock(return_value=validation)
-    with pytest.raises(SystemExit):
-        main()
-    mock_runner.assert_called_once()
-    assert "ecommerce.orders passed" in caplog.text
-    assert "ecommerce.sessions passed" in caplog.text
-    assert "ecommerce.users failed" in caplog.text
-
-
-@patch("sys.argv", new=["spectacles", "content"])
-@patch("spectacles.cli.Runner")
-@patch("spectacles.cli.LookerClient", autospec=True)
-def test_main_with_content_validator(
-    mock_client: MagicMock,
-    mock_runner: MagicMock,
-    env: None,
-    caplog: pytest.LogCaptureFixture,
-) -> None:
-    validation = build_validation("content")
-    mock_runner.return_value.validate_content = AsyncMock(return_value=validation)
-    with pytest.raises(SystemExit):
-        main()
-    mock_runner.assert_called_once()
-    assert "ecommerce.orders passed" in caplog.text
-    assert "ecommerce.sessions passed" in caplog.text
-    assert "ecommerce.users failed" in caplog.text
-
-
-@patch("sys.argv", new=["spectacles", "assert"])
+@pytest.mark.parametrize(
+    "command,method,expected_output",
+    [
+        (
+            "sql",
+            "validate_sql",
+            [
+                "ecommerce.orders passed",
+                "ecommerce.sessions passed",
+                "ecommerce.users failed",
+            ],
+        ),
+        (
+            "content",
+            "validate_content",
+            [
+                "ecommerce.orders passed",
+                "ecommerce.sessions passed",
+                "ecommerce.users failed",
+            ],
+        ),
+        (
+            "assert",
+            "validate_data_tests",
+            [
+                "ecommerce.orders passed",
+                "ecommerce.sessions passed",
+                "ecommerce.users failed",
+            ],
+        ),
+        (
+            "lookml",
+            "validate_lookml",
+            [
+                "eye_exam/eye_exam.model.lkml",
+                "Could not find a field named 'users__fail.first_name'",
+            ],
+        ),
+    ],
+)
 @patch("spectacles.cli.Runner", autospec=True)
 @patch("spectacles.cli.LookerClient", autospec=True)
-def test_main_with_assert_validator(
+def test_main_with_validator(
     mock_client: MagicMock,
     mock_runner: MagicMock,
+    command: str,
+    method: str,
+    expected_output: List[str],
     env: None,
     caplog: pytest.LogCaptureFixture,
 ) -> None:
-    validation = build_validation("assert")
-    mock_runner.return_value.validate_data_tests = AsyncMock(return_value=validation)
-    with pytest.raises(SystemExit):
+    validation = build_validation(command)
+    setattr(mock_runner.return_value, method, AsyncMock(return_value=validation))
+    with patch("sys.argv", ["spectacles", command]), pytest.raises(SystemExit):
         main()
     mock_runner.assert_called_once()
-    assert "ecommerce.orders passed" in caplog.text
-    assert "ecommerce.sessions passed" in caplog.text
-    assert "ecommerce.users failed" in caplog.text
+    for line in expected_output:
+        assert line in caplog.text
 
 
-@patch("sys.argv", new=["spectacles", "lookml"])
+@pytest.mark.parametrize("command", ("sql", "assert"))
 @patch("spectacles.cli.Runner", autospec=True)
 @patch("spectacles.cli.LookerClient", autospec=True)
-def test_main_with_lookml_validator(
+@patch("spectacles.cli.create_async_client", wraps=create_async_client)
+def test_concurrency_should_size_the_connection_pool(
+    mock_create_async_client: MagicMock,
     mock_client: MagicMock,
     mock_runner: MagicMock,
+    command: str,
     env: None,
-    caplog: pytest.LogCaptureFixture,
 ) -> None:
-    validation = build_validation("lookml")
-    mock_runner.return_value.validate_lookml = AsyncMock(return_value=validation)
-    with pytest.raises(SystemExit):
+    method = "validate_sql" if command == "sql" else "validate_data_tests"
+    setattr(
+        mock_runner.return_value,
+        method,
+        AsyncMock(return_value=build_validation(command)),
+    )
+    argv = ["spectacles", command, "--concurrency", "50"]
+    with patch("sys.argv", argv), pytest.raises(SystemExit):
         main()
-    mock_runner.assert_called_once()
-    assert "eye_exam/eye_exam.model.lkml" in caplog.text
-    assert "Could not find a field named 'users__fail.first_name'" in caplog.text
+    mock_create_async_client.assert_called_once_with(max_connections=50)
+    assert mock_client.call_args.kwargs["max_connections"] == 50
 
 
 @patch("sys.argv", new=["spectacles", "connect"])
@@ -445,51 +457,51 @@ def test_process_pin_imports_with_multiple_refs() -> None:
     assert output == {"welcome_to_looker": "testing-imports", "eye_exam": "123abc"}
 
 
-def test_preprocess_dashes_with_folder_ids_should_work() -> None:
-    args = [
-        preprocess_dash(arg)
-        for arg in ["--folders", "40", "25", "-41", "-1", "-344828", "3929"]
-    ]
-    assert args == ["--folders", "40", "25", "~41", "~1", "~344828", "3929"]
-
-
-def test_preprocess_dashes_with_model_explores_should_work() -> None:
-    args = [
-        preprocess_dash(arg)
-        for arg in [
-            "--explores",
-            "model_a/explore_a",
-            "-model_b/explore_b",
-            "model_c/explore_c",
-            "-model_d/explore_d",
-        ]
-    ]
-    assert args == [
-        "--explores",
-        "model_a/explore_a",
-        "~model_b/explore_b",
-        "model_c/explore_c",
-        "~model_d/explore_d",
-    ]
-
-
-def test_preprocess_dashes_with_wildcards_should_work() -> None:
-    args = [
-        preprocess_dash(arg)
-        for arg in (
-            "--explores",
-            "*/explore_a",
-            "-model_b/*",
-            "model-a/explore-a",
-            "*/*",
-            "-*/*",
-        )
-    ]
-    assert args == [
-        "--explores",
-        "*/explore_a",
-        "~model_b/*",
-        "model-a/explore-a",
-        "*/*",
-        "~*/*",
-    ]
+@pytest.mark.parametrize(
+    "args,expected",
+    [
+        (
+            ("--folders", "40", "25", "-41", "-1", "-344828", "3929"),
+            ("--folders", "40", "25", "~41", "~1", "~344828", "3929"),
+        ),
+        (
+            (
+                "--explores",
+                "model_a/explore_a",
+                "-model_b/explore_b",
+                "model_c/explore_c",
+                "-model_d/explore_d",
+            ),
+            (
+                "--explores",
+                "model_a/explore_a",
+                "~model_b/explore_b",
+                "model_c/explore_c",
+                "~model_d/explore_d",
+            ),
+        ),
+        (
+            (
+                "--explores",
+                "*/explore_a",
+                "-model_b/*",
+                "model-a/explore-a",
+                "*/*",
+                "-*/*",
+            ),
+            (
+                "--explores",
+                "*/explore_a",
+                "~model_b/*",
+                "model-a/explore-a",
+                "*/*",
+                "~*/*",
+            ),
+        ),
+    ],
+    ids=["folder_ids", "model_explores", "wildcards"],
+)
+def test_preprocess_dashes_should_work(
+    args: Tuple[str, ...], expected: Tuple[str, ...]
+) -> None:
+    assert tuple(preprocess_dash(arg) for arg in args) == expected
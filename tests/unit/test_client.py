@@ -1,6 +1,9 @@
 import asyncio
 import inspect
+import json
 import time
+from dataclasses import replace
+from pathlib import Path
 from typing import Any, Callable, Dict, List, Tuple
 from unittest.mock import AsyncMock, patch
 
@@ -8,7 +11,7 @@ import httpx
 import pytest
 import respx
 
-from spectacles.client import AccessToken, LookerClient
+from spectacles.client import DEFAULT_RETRIES, AccessToken, LookerClient
 from spectacles.exceptions import LookerApiError
 
 
@@ -32,8 +35,14 @@ def get_client_method_names() -> List[str]:
         member[0] for member in client_members if not member[0].startswith("__")
     ]
     for skip_method in (
+        "_clear_state_cache",
+        "_disk_cache_path",
+        "_endpoint",
+        "_write_disk_cache",
         "authenticate",
         "cancel_query_task",
+        "log_latencies",
+        "report_latencies",
         "request",
         "get",
         "post",
@@ -57,6 +66,7 @@ def client_kwargs() -> Dict[str, Dict[str, Any]]:
         all_lookml_tests={"project": "project_name"},
         run_lookml_test={"project": "project_name"},
         get_lookml_models={},
+        get_lookml_models_for_project={"project": "project_name"},
         get_lookml_dimensions={"model": "model_name", "explore": "explore_name"},
         create_query={
             "model": "model_name",
@@ -163,3 +173,219 @@ async def test_bad_http_status_should_cause_backoff_and_retry(
     )
     await looker_client.run_lookml_test(project=project)
     assert mocked_api["run_lookml_test"].call_count == 3
+
+
+async def test_get_active_branch_name_should_not_multiply_retries(
+    looker_client: LookerClient, mocked_api: respx.MockRouter
+) -> None:
+    mocked_api.get("projects/eye_exam/git_branch", name="get_active_branch").respond(
+        502
+    )
+    with pytest.raises(LookerApiError):
+        await looker_client.get_active_branch_name("eye_exam")
+    assert mocked_api["get_active_branch"].call_count == DEFAULT_RETRIES
+
+
+async def test_update_workspace_should_skip_request_if_already_in_workspace(
+    looker_client: LookerClient, mocked_api: respx.MockRouter
+) -> None:
+    await looker_client.update_workspace("production")
+    assert not mocked_api["update_workspace"].called
+
+    await looker_client.update_workspace("dev")
+    await looker_client.update_workspace("dev")
+    assert mocked_api["update_workspace"].call_count == 1
+
+
+async def test_expired_access_token_should_restore_dev_workspace(
+    looker_client: LookerClient, mocked_api: respx.MockRouter
+) -> None:
+    mocked_api.get("session").respond(200, json={"workspace_id": "dev"})
+    await looker_client.update_workspace("dev")
+    assert looker_client.access_token
+    looker_client.access_token = replace(looker_client.access_token, expires_at=0)
+
+    await looker_client.get_workspace()
+    assert mocked_api["login"].call_count == 2
+    assert mocked_api["update_workspace"].call_count == 2
+    assert looker_client.workspace == "dev"
+
+
+async def test_get_lookml_models_should_be_cached_until_workspace_changes(
+    looker_client: LookerClient, mocked_api: respx.MockRouter
+) -> None:
+    mocked_api.get("lookml_models", name="get_lookml_models").respond(
+        200, json=[{"name": "eye_exam", "project_name": "eye_exam", "explores": []}]
+    )
+    fields = ["name", "project_name", "explores"]
+    first = await looker_client.get_lookml_models(fields=fields)
+    second = await looker_client.get_lookml_models(fields=fields)
+    assert first == second
+    assert mocked_api["get_lookml_models"].call_count == 1
+
+    await looker_client.update_workspace("dev")
+    await looker_client.get_lookml_models(fields=fields)
+    assert mocked_api["get_lookml_models"].call_count == 2
+
+
+async def test_get_lookml_models_for_project_should_only_return_project_models(
+    looker_client: LookerClient, mocked_api: respx.MockRouter
+) -> None:
+    mocked_api.get("lookml_models").respond(
+        200,
+        json=[
+            {"name": "eye_exam", "project_name": "eye_exam", "explores": []},
+            {"name": "other", "project_name": "other_project", "explores": []},
+        ],
+    )
+    models = await looker_client.get_lookml_models_for_project(
+        "eye_exam", fields=["name", "explores"]
+    )
+    assert [model["name"] for model in models] == ["eye_exam"]
+
+
+async def test_get_lookml_dimensions_should_be_cached_until_branch_changes(
+    looker_client: LookerClient, mocked_api: respx.MockRouter
+) -> None:
+    mocked_api.get(
+        "lookml_models/eye_exam/explores/users", name="get_lookml_dimensions"
+    ).respond(200, json={"fields": {"dimensions": [{"name": "users.id"}]}})
+    mocked_api.put("projects/eye_exam/git_branch").respond(200)
+    await looker_client.get_lookml_dimensions("eye_exam", "users")
+    await looker_client.get_lookml_dimensions("eye_exam", "users")
+    assert mocked_api["get_lookml_dimensions"].call_count == 1
+
+    await looker_client.checkout_branch("eye_exam", "pytest")
+    await looker_client.get_lookml_dimensions("eye_exam", "users")
+    assert mocked_api["get_lookml_dimensions"].call_count == 2
+
+
+async def test_get_active_branch_should_be_cached_until_branch_changes(
+    looker_client: LookerClient, mocked_api: respx.MockRouter
+) -> None:
+    mocked_api.get("projects/eye_exam/git_branch", name="get_active_branch").respond(
+        200, json={"name": "pytest", "ref": "abc1234"}
+    )
+    mocked_api.put("projects/eye_exam/git_branch").respond(200)
+    await looker_client.get_active_branch("eye_exam")
+    assert await looker_client.get_active_branch_name("eye_exam") == "pytest"
+    assert mocked_api["get_active_branch"].call_count == 1
+
+    await looker_client.checkout_branch("eye_exam", "pytest")
+    await looker_client.get_active_branch("eye_exam")
+    assert mocked_api["get_active_branch"].call_count == 2
+
+
+async def test_get_all_branches_should_be_cached_until_a_branch_is_deleted(
+    looker_client: LookerClient, mocked_api: respx.MockRouter
+) -> None:
+    mocked_api.get("projects/eye_exam/git_branches", name="get_all_branches").respond(
+        200, json=[{"name": "pytest"}, {"name": "tmp_spectacles_t0"}]
+    )
+    mocked_api.delete("projects/eye_exam/git_branch/tmp_spectacles_t0").respond(200)
+    await looker_client.get_all_branches("eye_exam")
+    await looker_client.get_all_branches("eye_exam")
+    assert mocked_api["get_all_branches"].call_count == 1
+
+    await looker_client.delete_branch("eye_exam", "tmp_spectacles_t0")
+    await looker_client.get_all_branches("eye_exam")
+    assert mocked_api["get_all_branches"].call_count == 2
+
+
+async def test_report_latencies_should_group_requests_by_endpoint(
+    looker_client: LookerClient, mocked_api: respx.MockRouter
+) -> None:
+    for explore in ("users", "orders"):
+        mocked_api.get(f"lookml_models/eye_exam/explores/{explore}").respond(
+            200, json={"fields": {"dimensions": []}}
+        )
+        await looker_client.get_lookml_dimensions("eye_exam", explore)
+
+    report = looker_client.report_latencies()
+    summary = report["GET lookml_models/*/explores/*"]
+    assert summary["count"] == 2
+    assert 0 <= summary["p50"] <= summary["p95"] <= summary["p99"]
+    assert list(report) == ["GET lookml_models/*/explores/*"]
+
+
+async def test_report_latencies_should_include_failed_requests(
+    looker_client: LookerClient, mocked_api: respx.MockRouter
+) -> None:
+    mocked_api.get("lookml_models/eye_exam/explores/users").mock(
+        side_effect=httpx.ConnectTimeout
+    )
+    with pytest.raises(httpx.ConnectTimeout):
+        await looker_client.get(
+            looker_client.api_url + "lookml_models/eye_exam/explores/users"
+        )
+
+    report = looker_client.report_latencies()
+    assert report["GET lookml_models/*/explores/*"]["count"] == 1
+
+
+async def test_get_lookml_dimensions_should_persist_to_cache_dir(
+    looker_client: LookerClient, mocked_api: respx.MockRouter, tmp_path: Path
+) -> None:
+    mocked_api.get(
+        "lookml_models/eye_exam/explores/users", name="get_lookml_dimensions"
+    ).respond(200, json={"fields": {"dimensions": [{"name": "users.id"}]}})
+    looker_client.cache_dir = tmp_path
+    looker_client.lookml_revision = "eye_exam@abc1234"
+    await looker_client.get_lookml_dimensions("eye_exam", "users")
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # Simulate a later run against the same LookML revision
+    looker_client._state_cache.clear()
+    dimensions = await looker_client.get_lookml_dimensions("eye_exam", "users")
+    assert dimensions == [{"name": "users.id"}]
+    assert mocked_api["get_lookml_dimensions"].call_count == 1
+
+
+async def test_get_lookml_dimensions_should_refetch_corrupt_cache_file(
+    looker_client: LookerClient, mocked_api: respx.MockRouter, tmp_path: Path
+) -> None:
+    mocked_api.get(
+        "lookml_models/eye_exam/explores/users", name="get_lookml_dimensions"
+    ).respond(200, json={"fields": {"dimensions": [{"name": "users.id"}]}})
+    looker_client.cache_dir = tmp_path
+    looker_client.lookml_revision = "eye_exam@abc1234"
+    cache_path = looker_client._disk_cache_path(
+        "lookml_dimensions", "eye_exam", "users"
+    )
+    assert cache_path is not None
+    # Simulate a write that was cut off partway through
+    cache_path.write_bytes(b'[{"name": "us')
+
+    dimensions = await looker_client.get_lookml_dimensions("eye_exam", "users")
+    assert dimensions == [{"name": "users.id"}]
+    assert mocked_api["get_lookml_dimensions"].call_count == 1
+    assert json.loads(cache_path.read_bytes()) == [{"name": "users.id"}]
+    assert list(tmp_path.iterdir()) == [cache_path]
+
+
+@pytest.mark.parametrize(
+    "dimensions", [["users.id", "users.age"], []], ids=["dimensions", "none"]
+)
+async def test_create_query_should_select_no_rows(
+    looker_client: LookerClient, mocked_api: respx.MockRouter, dimensions: List[str]
+) -> None:
+    mocked_api.post(
+        "queries", params={"fields": "id,share_url"}, name="create_query"
+    ).respond(200, json={"id": "10319", "share_url": "https://example.com/x/abc"})
+    query = await looker_client.create_query(
+        model="eye_exam",
+        explore="users__create_query",
+        dimensions=dimensions,
+        fields=["id", "share_url"],
+    )
+    assert query["id"] == "10319"
+    request = mocked_api["create_query"].calls.last.request
+    assert request.headers["Content-Type"] == "application/json"
+    body = json.loads(request.content)
+    assert body == {
+        "model": "eye_exam",
+        "view": "users__create_query",
+        "fields": dimensions,
+        "limit": 0,
+        "filter_expression": "1=2",
+    }
@@ -1,6 +1,11 @@
+from typing import Optional
+
 import pytest
+import respx
 
 from spectacles.client import LookerClient
+from spectacles.lookml import Project
+from spectacles.models import JsonDict
 from spectacles.validators.content import ContentValidator
 
 
@@ -23,3 +28,34 @@ def test_get_tile_type_with_bad_keys_should_raise_key_error(
     content = {"lookml_dashboard": "Something goes here."}
     with pytest.raises(KeyError):
         validator._get_tile_type(content)
+
+
+async def test_validate_should_list_folders_once(
+    validator: ContentValidator, mocked_api: respx.MockRouter, project: Project
+) -> None:
+    def folder(id: str, parent_id: Optional[str], personal: bool = False) -> JsonDict:
+        return {
+            "id": id,
+            "parent_id": parent_id,
+            "is_personal": personal,
+            "is_personal_descendant": False,
+        }
+
+    mocked_api.get("folders", name="all_folders").respond(
+        200,
+        json=[
+            folder("1", None),
+            folder("2", "1"),
+            folder("3", "2"),
+            folder("4", None),
+            folder("5", None, personal=True),
+        ],
+    )
+    mocked_api.get("content_validation").respond(200, json={"content_with_errors": []})
+    validator.include_folders.append("1")
+    validator.exclude_folders.append("4")
+
+    await validator.validate(project)
+    assert mocked_api["all_folders"].call_count == 1
+    assert validator.included_folders == ["1", "2", "3"]
+    assert validator.excluded_folders == ["5", "4"]
@@ -1,9 +1,19 @@
+import asyncio
+import pickle
 from copy import deepcopy
 
 import pytest
+import respx
 
+from spectacles.client import LookerClient
 from spectacles.exceptions import SqlError
-from spectacles.lookml import Dimension, Explore, Model, Project
+from spectacles.lookml import (
+    Dimension,
+    Explore,
+    Model,
+    Project,
+    parse_explore_dimensions,
+)
 from tests.utils import load_resource
 
 
@@ -41,6 +51,37 @@ def test_dimension_from_json() -> None:
     assert not dimension.ignore
 
 
+def test_dimension_url_should_include_base_url() -> None:
+    json_dict = load_resource("response_dimensions.json")
+    assert isinstance(json_dict, list)
+    dimension = Dimension.from_json(
+        json_dict[0], "eye_exam", "users", "https://spectacles.looker.com"
+    )
+    assert dimension.relative_url == (
+        "/projects/spectacles/files/test_view.view.lkml?line=340"
+    )
+    assert dimension.url == (
+        "https://spectacles.looker.com"
+        "/projects/spectacles/files/test_view.view.lkml?line=340"
+    )
+
+
+def test_parse_explore_dimensions_should_prefix_urls_and_drop_hidden() -> None:
+    json_dict = deepcopy(load_resource("response_dimensions.json"))
+    assert isinstance(json_dict, list)
+    json_dict[1]["hidden"] = True
+    explore = Explore("users", "eye_exam")
+    base_url = "https://spectacles.looker.com"
+    dimensions = parse_explore_dimensions(json_dict, explore, base_url)
+    assert len(dimensions) == 2
+    assert all(d.url and d.url.startswith(base_url) for d in dimensions)
+
+    visible = parse_explore_dimensions(
+        json_dict, explore, base_url, ignore_hidden_fields=True
+    )
+    assert [d.name for d in visible] == ["test_view.dimension_one"]
+
+
 def test_ignored_dimension_with_whitespace() -> None:
     name = "test_view.dimension_one"
     model_name = "eye_exam"
@@ -436,3 +477,38 @@ def test_project_get_results_can_return_explore_and_dimension_level_errors(
         assert len(results["errors"]) == 1
     else:
         assert len(results["errors"]) == 2
+
+
+async def test_get_dimensions_should_only_fetch_once(
+    looker_client: LookerClient, mocked_api: respx.MockRouter
+) -> None:
+    mocked_api.get(
+        "lookml_models/eye_exam/explores/users", name="get_lookml_dimensions"
+    ).respond(
+        200, json={"fields": {"dimensions": load_resource("response_dimensions.json")}}
+    )
+    explore = Explore("users", "eye_exam")
+    first, second = await asyncio.gather(
+        explore.get_dimensions(looker_client), explore.get_dimensions(looker_client)
+    )
+    assert first is second
+    assert len(first) == 2
+    assert explore.dimensions_loaded
+    assert mocked_api["get_lookml_dimensions"].call_count == 1
+
+
+async def test_explore_should_copy_and_pickle_after_loading_dimensions(
+    looker_client: LookerClient, mocked_api: respx.MockRouter
+) -> None:
+    mocked_api.get(
+        "lookml_models/eye_exam/explores/users", name="get_lookml_dimensions"
+    ).respond(
+        200, json={"fields": {"dimensions": load_resource("response_dimensions.json")}}
+    )
+    explore = Explore("users", "eye_exam")
+    await explore.get_dimensions(looker_client)
+    for copied in (deepcopy(explore), pickle.loads(pickle.dumps(explore))):
+        assert copied == explore
+        assert copied.dimensions_loaded
+        assert await copied.get_dimensions(looker_client) == explore.dimensions
+    assert mocked_api["get_lookml_dimensions"].call_count == 1
@@ -4,7 +4,11 @@ from typing import List
 import pytest
 
 from spectacles.exceptions import SpectaclesException
-from spectacles.project_select import is_selected, selector_to_pattern
+from spectacles.project_select import (
+    CompiledSelector,
+    is_selected,
+    selector_to_pattern,
+)
 
 
 def test_invalid_format_should_raise_value_error() -> None:
@@ -69,3 +73,13 @@ def test_exclude_explore_wildcard_should_not_match(filters: List[str]) -> None:
 @pytest.mark.parametrize("filters", permutations(["*/*", "-model_a/explore_a"]))
 def test_exclude_exact_model_and_explore_should_not_match(filters: List[str]) -> None:
     assert not is_selected("model_a", "explore_a", filters)
+
+
+def test_compiled_selector_should_apply_includes_and_excludes() -> None:
+    selector = CompiledSelector(
+        ["model_a/*", "model_b/explore_a", "-model_a/explore_b"]
+    )
+    assert selector.matches("model_a", "explore_a")
+    assert not selector.matches("model_a", "explore_b")
+    assert selector.matches("model_b", "explore_a")
+    assert not selector.matches("model_b", "explore_b")
@@ -1,9 +1,13 @@
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Union
+from typing import Any, Awaitable, Callable, Dict, List, Union
 
+from spectacles.lookml import Project
 from spectacles.models import JsonDict
 
+# Builds a project from a name, selector filters, and build_project's keyword args
+ProjectBuilder = Callable[..., Awaitable[Project]]
+
 
 def load_resource(filename: str) -> Union[List[JsonDict], JsonDict]:
     """Helper method to load a JSON file from tests/resources and parse it."""